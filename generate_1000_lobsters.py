@@ -1,137 +1,324 @@
-from PIL import Image, ImageDraw
+from PIL import Image
 import random
 import math
 import json
 import os
+import argparse
+import glob
+import io
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from multiprocessing import Pool
 
 # Import the lobster drawing code
-import sys
-sys.path.insert(0, '/home/claude')
-from simple_lobster import TRAITS, draw_simple_lobster, generate_traits
+from simple_lobster import TRAITS, token_rng
+from lobster_layers import FramePool, draw_layered_lobster, lobster_box, lobster_layers
+from lobster_encoders import OUTPUT_FORMATS, encode_image, image_extension, is_vector_format
+from lobster_sampler import TraitSampler
+from lobster_rarity import RARITY_METHODS, insert_ranks, rank_collection, score_matrix, trait_matrix
+from lobster_svg import svg_lobster
+from lobster_index import TraitIndex, write_trait_index
+from lobster_metadata import METADATA_FORMATS, rarity_percentile, token_metadata, write_metadata
+from lobster_sinks import OUTPUT_SINKS, layout_path, open_sink
+from lobster_cache import DEFAULT_CACHE_MB, RenderCache
+from lobster_impact import affected_tokens, load_fingerprints, render_fingerprints, write_fingerprints
 
 # Configuration
-output_dir = "/mnt/user-data/outputs/lobster_collection_1000"
-os.makedirs(output_dir, exist_ok=True)
-os.makedirs(f"{output_dir}/images", exist_ok=True)
-os.makedirs(f"{output_dir}/metadata", exist_ok=True)
+DEFAULT_OUTPUT_DIR = "lobster_collection_1000"
 
 w, h = 1400, 1400
 
+# Directories a run writes besides its tiers. Tier names are plain names
+# without dots, so they can't collide with the files (trait tables, summary,
+# fingerprints, jsonl bundles, archives) either.
+RESERVED_DIRS = ("images", "metadata", "index")
+TIER_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+# Per-token work is timed in these stages for the throughput report
+STAGES = ("render", "encode", "write")
+_stats_lock = threading.Lock()
+
+# TRAITS compiled once instead of rebuilding the weight lists for every token
+trait_sampler = TraitSampler()
+
+# Per-process frames reused across tokens (see FramePool)
+frame_pool = FramePool()
+
 def calculate_rarity_score(traits):
-    """Calculate rarity score based on trait rarities (lower rarity = higher score)"""
-    total_score = 0
-    for category, trait_name in traits.items():
-        rarity = TRAITS[category][trait_name]["rarity"]
-        # Lower rarity percentage = higher score (invert it)
-        total_score += (100 - rarity)
-    return round(total_score, 2)
+    """Calculate rarity score based on trait rarities (lower rarity = higher score)
+    
+    The "weights" score of lobster_rarity for one token; collections are
+    scored all at once with rank_collection.
+    """
+    score = float(score_matrix(trait_matrix([traits], trait_sampler), "weights", trait_sampler)[0])
+    return int(score) if score.is_integer() else score
 
-def generate_single_lobster(token_id):
-    """Generate one lobster NFT with image and metadata"""
+def token_layers(token_id, seed=None, traits=None):
+    """Traits and (layer, args) pairs of one token, with its random details
+    
+    Traits are drawn from the token's generator unless assigned, and the
+    layer variants (tail spots, googly pupils) come from the generator after
+    that, so assigned and sampled traits can give different details.
+    """
+    
+    rng = token_rng(seed, token_id) if seed is not None else random
     
     # Generate random traits
-    traits = generate_traits()
+    if traits is None:
+        traits = trait_sampler.sample(rng)
+    return traits, lobster_layers(traits, rng)
+
+def render_token_tiers(token_id, seed=None, traits=None, tiers=None, frames=None, vector=False,
+                       layers=None):
+    """Render one token at every tier size in one pass
+    
+    tiers maps a tier name (its output directory) to a pixel width and
+    defaults to the full-size image only. Every tier is drawn directly at its
+    own scale from the same traits and random details. With a FramePool the
+    images are drawn on pooled frames that must be released after encoding.
+    vector=True returns SVG documents instead of images. Pass layers (with
+    the traits, from token_layers) to skip working them out again. Returns
+    (traits, {tier: image}).
+    """
+    
+    if tiers is None:
+        tiers = {"images": w}
+    if layers is None:
+        traits, layers = token_layers(token_id, seed, traits)
     
     # Get background color
     bg_color = TRAITS["Background"][traits["Background"]]["color"]
+    images = {}
+    for tier, size in tiers.items():
+        if vector:
+            # Vector output skips rasterizing; the size only sets the SVG's width
+            images[tier] = svg_lobster(traits, size=size, layers=layers)
+            continue
+        
+        # Create image
+        scale = size / w
+        frame_size = (size, round(h * scale))
+        center_x = frame_size[0] / 2
+        center_y = frame_size[1] / 2
+        if frames is None:
+            img = Image.new('RGB', frame_size, bg_color)
+        else:
+            img = frames.acquire(bg_color, frame_size, lobster_box(center_x, center_y, scale))
+        
+        # Draw lobster in center from the cached trait layers
+        draw_layered_lobster(img, center_x, center_y, traits, scale=scale, layers=layers)
+        images[tier] = img
     
-    # Create image
-    img = Image.new('RGB', (w, h), bg_color)
-    draw = ImageDraw.Draw(img)
-    
-    # Draw lobster in center
-    center_x = w / 2
-    center_y = h / 2
-    
-    draw_simple_lobster(draw, center_x, center_y, traits, bg_color)
-    
-    # Save image
-    image_filename = f"{token_id}.png"
-    image_path = f"{output_dir}/images/{image_filename}"
-    img.save(image_path)
-    
-    # Calculate rarity score
-    rarity_score = calculate_rarity_score(traits)
-    
-    # Generate metadata (OpenSea/standard NFT format)
-    metadata = {
-        "name": f"Lobster #{token_id}",
-        "description": "A unique generative lobster from the Lobster NFT collection. Each lobster is algorithmically generated with randomized traits and varying rarity.",
-        "image": f"{image_filename}",
-        "external_url": "https://your-project-url.com",
-        "attributes": [
-            {"trait_type": category, "value": value} 
-            for category, value in traits.items()
-        ],
-        "rarity_score": rarity_score
-    }
+    return traits, images
+
+def render_token(token_id, seed=None, traits=None, size=None):
+    """Render one token in isolation, returning its traits and image
     
-    # Save metadata
-    metadata_path = f"{output_dir}/metadata/{token_id}.json"
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    With a collection seed every token has its own random generator, so any
+    single token can be re-rendered without replaying the rest of the run.
+    Pass traits to render pre-assigned traits (e.g. from unique mode) and
+    size to draw directly at a smaller (or larger) resolution than w x h.
+    """
     
-    return {
+    traits, images = render_token_tiers(token_id, seed, traits, {"images": size or w})
+    return traits, images["images"]
+
+def add_stage_time(stats, stage, seconds):
+    """Accumulate busy time for a stage (safe to call from writer threads)"""
+    if stats is not None:
+        with _stats_lock:
+            stats[stage] += seconds
+
+def lobster_record(token_id, traits, tiers, extension, output_dir=DEFAULT_OUTPUT_DIR, layout="flat"):
+    """Record of one lobster: its traits and where its image tiers and metadata live
+    
+    image is the image's path inside a tier directory, which depends on the
+    layout (see lobster_sinks.layout_path) and is what the metadata refers to.
+    """
+    
+    image = layout_path(token_id, f"{token_id}.{extension}", layout)
+    tier_paths = {tier: f"{output_dir}/{tier}/{image}" for tier in tiers}
+    lobster = {
         "token_id": token_id,
         "traits": traits,
-        "rarity_score": rarity_score,
-        "image_path": image_path,
-        "metadata_path": metadata_path
+        "image": image,
+        "image_path": tier_paths["images"],
+        "metadata_path": f"{output_dir}/metadata/{layout_path(token_id, f'{token_id}.json', layout)}"
     }
+    if len(tier_paths) > 1:
+        lobster["tier_paths"] = tier_paths
+    return lobster
 
-def generate_collection(num_lobsters=1000):
-    """Generate the full NFT collection"""
+def encode_lobster(token_id, traits, images, encoding=None, stats=None, frames=None,
+                   cache=None, cache_keys=None):
+    """Encode the rendered tier images of one lobster
     
-    print(f"🦞 Generating {num_lobsters} Lobster NFTs...")
-    print(f"📁 Output directory: {output_dir}")
-    print("=" * 60)
+    images maps tier names to images (see render_token_tiers). encoding
+    holds the encode_image options (output_format, compress_level,
+    optimize). Images are handed back to frames (a FramePool) as soon as
+    they are encoded, and stored in cache (a RenderCache) under cache_keys.
+    Returns (token_id, traits, {tier: encoded bytes}).
+    """
     
-    collection = []
+    if encoding is None:
+        encoding = {}
+    encoded = {}
+    for tier, img in images.items():
+        start = time.perf_counter()
+        buffer = io.BytesIO()
+        encode_image(img, buffer, **encoding)
+        if frames is not None and not isinstance(img, str):
+            frames.release(img)
+        encoded[tier] = buffer.getvalue()
+        if cache is not None:
+            cache.put(cache_keys[tier], encoded[tier])
+        add_stage_time(stats, "encode", time.perf_counter() - start)
+    return token_id, traits, encoded
+
+def cache_lookup(cache, token_id, seed, traits, tiers, encoding, stats):
+    """Look a token up in the render cache, returning (traits, layers, cache_keys, encoded)
     
-    for i in range(num_lobsters):
-        token_id = i + 1
-        lobster = generate_single_lobster(token_id)
-        collection.append(lobster)
-        
-        # Progress updates
-        if token_id % 50 == 0:
-            print(f"✓ Generated {token_id}/{num_lobsters} lobsters...")
+    The keys hold what decides the pixels: the background color, the
+    token's layers, random details included (see token_layers), and each
+    tier's size against the w x h canvas it is scaled from. encoded is
+    the cached {tier: bytes} when every tier is cached and None otherwise;
+    on a miss render with the returned traits and layers.
+    """
     
-    print("=" * 60)
-    print(f"✅ All {num_lobsters} lobsters generated!")
+    traits, layers = token_layers(token_id, seed, traits)
+    bg_color = TRAITS["Background"][traits["Background"]]["color"]
+    cache_keys = {tier: cache.key(bg_color, layers, size, encoding, (w, h)) for tier, size in tiers.items()}
+    encoded = {}
+    for tier, key in cache_keys.items():
+        encoded[tier] = cache.get(key)
+        if encoded[tier] is None:
+            if stats is not None:
+                stats["cache_misses"] += 1
+            return traits, layers, cache_keys, None
+    if stats is not None:
+        stats["cache_hits"] += 1
+    return traits, layers, cache_keys, encoded
+
+def save_lobster(lobster, images, stats=None, sink=None):
+    """Write the encoded tier images of a lobster record to their paths
     
-    # Sort by rarity score to assign rarity ranks
-    print("\n📊 Calculating rarity ranks...")
-    collection.sort(key=lambda x: x['rarity_score'], reverse=True)
+    Files go through sink (see lobster_sinks) when given. The metadata file
+    is written later by write_metadata, once the rarity rank of every token
+    is known, so each file is written exactly once.
+    """
     
-    # Update metadata with rarity ranks
-    for rank, lobster in enumerate(collection, 1):
-        metadata_path = lobster['metadata_path']
-        with open(metadata_path, 'r') as f:
-            metadata = json.load(f)
-        
-        metadata['rarity_rank'] = rank
-        metadata['rarity_percentile'] = round((1 - (rank / len(collection))) * 100, 2)
+    start = time.perf_counter()
+    tier_paths = lobster.get("tier_paths", {"images": lobster["image_path"]})
+    for tier, data in images.items():
+        if sink is not None:
+            sink.write(tier_paths[tier], data)
+            continue
+        with open(tier_paths[tier], 'wb') as f:
+            f.write(data)
+    add_stage_time(stats, "write", time.perf_counter() - start)
+    return lobster
+
+def generate_single_lobster(token_id, seed=None, encoding=None, stats=None, traits=None, tiers=None,
+                            frames=None, cache=None):
+    """Render and encode one lobster NFT (every image tier), see encode_lobster
+    
+    With a cache (a RenderCache, seeded runs only) previously rendered
+    tokens are served from it without drawing or encoding.
+    """
+    
+    layers = cache_keys = None
+    if cache is not None:
+        traits, layers, cache_keys, encoded = cache_lookup(cache, token_id, seed, traits,
+                                                           tiers or {"images": w}, encoding, stats)
+        if encoded is not None:
+            return token_id, traits, encoded
+    
+    start = time.perf_counter()
+    vector = is_vector_format((encoding or {}).get("output_format", "png"))
+    traits, images = render_token_tiers(token_id, seed, traits, tiers, frames, vector, layers)
+    add_stage_time(stats, "render", time.perf_counter() - start)
+    
+    return encode_lobster(token_id, traits, images, encoding, stats, frames, cache, cache_keys)
+
+def generate_lobster_batch(tokens, seed=None, encoding=None, writer_threads=0, queue_depth=16,
+                           tiers=None, cache=None):
+    """Render and encode a batch of lobsters, returning (results, stage_seconds)
+    
+    tokens is a list of (token_id, traits) pairs; traits is None unless the
+    traits were assigned up front. Each result is (token_id, traits,
+    {tier: encoded bytes}).
+    
+    With writer_threads > 0 the batch runs as a pipeline: this thread keeps
+    rendering while a pool of encoder threads compresses the finished
+    images (Pillow releases the GIL while compressing). At most queue_depth
+    rendered images wait for an encoder, which bounds memory. Results come
+    back in token order either way. cache is an optional RenderCache; the
+    stats count its hits and misses per token.
+    """
+    
+    stats = dict.fromkeys(STAGES, 0.0)
+    stats.update(cache_hits=0, cache_misses=0)
+    
+    if writer_threads <= 0:
+        results = [generate_single_lobster(token_id, seed, encoding, stats, traits, tiers, frame_pool,
+                                           cache)
+                   for token_id, traits in tokens]
+        return results, stats
+    
+    vector = is_vector_format((encoding or {}).get("output_format", "png"))
+    # Frames come back from the encoders a few at a time; keep one per thread
+    frame_pool.max_free = writer_threads + 1
+    results = []
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=writer_threads) as writers:
+        for token_id, traits in tokens:
+            layers = cache_keys = None
+            if cache is not None:
+                traits, layers, cache_keys, encoded = cache_lookup(cache, token_id, seed, traits,
+                                                                   tiers or {"images": w}, encoding, stats)
+                if encoded is not None:
+                    # Queued behind the tokens still encoding, so results stay in order
+                    pending.append(Future())
+                    pending[-1].set_result((token_id, traits, encoded))
+                    continue
+            
+            start = time.perf_counter()
+            traits, images = render_token_tiers(token_id, seed, traits, tiers, frame_pool, vector, layers)
+            add_stage_time(stats, "render", time.perf_counter() - start)
+            
+            # Bounded hand-off: wait for the oldest image before queueing another
+            if len(pending) >= max(1, queue_depth):
+                results.append(pending.popleft().result())
+            pending.append(writers.submit(encode_lobster, token_id, traits, images, encoding, stats,
+                                          frame_pool, cache, cache_keys))
         
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        results.extend(future.result() for future in pending)
     
-    # Generate collection summary
-    print("📋 Generating collection summary...")
+    return results, stats
+
+def build_summary(ranked, total_supply, seed, rarity_method, image_tiers):
+    """Collection summary (trait and rarity distributions) of a ranked collection"""
     
     # Count trait distributions
     trait_distribution = {}
     for category in TRAITS.keys():
         trait_distribution[category] = {}
-        for lobster in collection:
+        for lobster in ranked:
             trait_value = lobster['traits'][category]
             if trait_value not in trait_distribution[category]:
                 trait_distribution[category][trait_value] = 0
             trait_distribution[category][trait_value] += 1
     
-    summary = {
+    return {
         "collection_name": "Lobster NFT Collection",
-        "total_supply": num_lobsters,
+        "total_supply": total_supply,
+        "seed": seed,
+        "rarity_method": rarity_method,
+        "image_tiers": image_tiers,
         "traits": {
             category: list(options.keys())
             for category, options in TRAITS.items()
@@ -141,9 +328,9 @@ def generate_collection(num_lobsters=1000):
             lobster["token_id"]: {
                 "rank": i + 1,
                 "score": lobster["rarity_score"],
-                "percentile": round((1 - ((i + 1) / len(collection))) * 100, 2)
+                "percentile": rarity_percentile(i + 1, len(ranked))
             }
-            for i, lobster in enumerate(collection)
+            for i, lobster in enumerate(ranked)
         },
         "top_10_rarest": [
             {
@@ -152,43 +339,830 @@ def generate_collection(num_lobsters=1000):
                 "score": lobster["rarity_score"],
                 "traits": lobster["traits"]
             }
-            for i, lobster in enumerate(collection[:10])
+            for i, lobster in enumerate(ranked[:10])
         ]
     }
+
+def print_collection_report(ranked, summary, summary_path, output_dir, title, index_dir=None,
+                            metadata_location=None, sink=None):
+    """Print the collection statistics and where everything was written"""
     
-    summary_path = f"{output_dir}/collection_summary.json"
-    with open(summary_path, 'w') as f:
-        json.dump(summary, f, indent=2)
-    
-    print(f"✅ Collection summary saved to: {summary_path}")
-    
-    # Print statistics
     print("\n" + "=" * 60)
     print("📈 COLLECTION STATISTICS")
     print("=" * 60)
-    print(f"Total Lobsters: {num_lobsters}")
+    print(f"Total Lobsters: {len(ranked)}")
     print(f"\n🏆 Top 5 Rarest Lobsters:")
-    for i, lobster in enumerate(collection[:5], 1):
+    for i, lobster in enumerate(ranked[:5], 1):
         print(f"  #{i}. Lobster #{lobster['token_id']} - Rarity Score: {lobster['rarity_score']}")
         print(f"      Traits: {lobster['traits']}")
     
     print(f"\n📊 Trait Distribution Highlights:")
-    for category, counts in trait_distribution.items():
+    for category, counts in summary["trait_distribution"].items():
         print(f"\n  {category}:")
         sorted_traits = sorted(counts.items(), key=lambda x: x[1], reverse=True)[:3]
         for trait, count in sorted_traits:
-            percentage = (count / num_lobsters) * 100
+            percentage = (count / len(ranked)) * 100
             print(f"    • {trait}: {count} ({percentage:.1f}%)")
     
     print("\n" + "=" * 60)
-    print("✅ COLLECTION GENERATION COMPLETE!")
+    print(f"✅ {title}")
     print("=" * 60)
-    print(f"📁 Images: {output_dir}/images/")
-    print(f"📄 Metadata: {output_dir}/metadata/")
+    location = sink.location if sink is not None else (lambda path: path)
+    print(f"📁 Images: {location(f'{output_dir}/images/')}")
+    for tier, size in summary["image_tiers"].items():
+        if tier != "images":
+            print(f"🖼️  {tier.capitalize()} ({size}px): {location(f'{output_dir}/{tier}/')}")
+    print(f"📄 Metadata: {metadata_location or f'{output_dir}/metadata/'}")
+    if index_dir is not None:
+        print(f"🗂️  Trait index: {index_dir}/")
     print(f"📊 Summary: {summary_path}")
     print("=" * 60)
+
+def trait_table_path(output_dir, shard=None, appended=None):
+    """Where a run (one shard of it, or a range of appended tokens) keeps its trait table"""
+    if appended is not None:
+        return f"{output_dir}/trait_table.tokens-{appended.start}-{appended.stop - 1}.json"
+    if shard is None:
+        return f"{output_dir}/trait_table.json"
+    return f"{output_dir}/trait_table.shard-{shard[0]}-of-{shard[1]}.json"
+
+def write_trait_table(collection, output_dir, seed, total_supply, image_tiers, extension, shard=None,
+                      layout="flat", appended=None, unique=False, sink="files", metadata_format="json",
+                      encoding=None):
+    """Write the compact table of every token's traits that merge_collection works from
+    
+    Tokens are stored as [token_id, value index per category] rows, so even a
+    100k-token table is a few MB and loads in well under a second. unique
+    records whether the traits were assigned up front (see iter_collection),
+    which decides how a token is rendered again; sink and metadata_format
+    record where the images went and how the metadata was written, and
+    encoding the encode_image options, so append_collection and
+    rebuild_collection can continue the collection the same way.
+    """
+    
+    lookups = [{value: i for i, value in enumerate(values)} for values in trait_sampler.values]
+    table = {
+        "seed": seed,
+        "total_supply": total_supply,
+        "shard": list(shard) if shard is not None else None,
+        "image_tiers": image_tiers,
+        "image_extension": extension,
+        "layout": layout,
+        "unique": unique,
+        "sink": sink,
+        "metadata_format": metadata_format,
+        "encoding": encoding,
+        "categories": trait_sampler.categories,
+        "values": trait_sampler.values,
+        "tokens": [
+            [lobster["token_id"]] + [lookup[lobster["traits"][category]]
+                                     for category, lookup in zip(trait_sampler.categories, lookups)]
+            for lobster in sorted(collection, key=lambda lobster: lobster["token_id"])
+        ],
+    }
+    with open(trait_table_path(output_dir, shard, appended), 'w') as f:
+        json.dump(table, f, separators=(",", ":"))
+
+def load_trait_tables(output_dir):
+    """Read every trait_table*.json in output_dir into lobster records
+    
+    The tables (shards, appended token ranges) must agree on the seed,
+    image tiers, encoding, layout and unique mode, and together cover tokens
+    1..total_supply exactly once, where total_supply is the largest any
+    table claims. Returns (first table, records in token order).
+    """
+    
+    paths = sorted(glob.glob(f"{output_dir}/trait_table*.json"))
+    if not paths:
+        raise ValueError(f"No trait tables found in {output_dir}")
+    
+    print(f"🧩 Reading {len(paths)} trait tables from {output_dir}...")
+    collection = []
+    first = None
+    total_supply = 0
+    for path in paths:
+        with open(path) as f:
+            table = json.load(f)
+        table.setdefault("layout", "flat")
+        table.setdefault("unique", False)
+        table.setdefault("sink", "hashed" if table["layout"] == "hashed" else "files")
+        table.setdefault("metadata_format", "json")
+        # Tables written before the encoding was recorded only know the extension
+        table.setdefault("encoding", None)
+        if first is None:
+            first = table
+        for key in ("seed", "image_tiers", "image_extension", "layout", "unique"):
+            if table[key] != first[key]:
+                raise ValueError(f"{os.path.basename(path)} has a different {key} "
+                                 f"({table[key]!r} vs {first[key]!r})")
+        if None not in (table["encoding"], first["encoding"]) and table["encoding"] != first["encoding"]:
+            raise ValueError(f"{os.path.basename(path)} has a different encoding "
+                             f"({table['encoding']!r} vs {first['encoding']!r})")
+        total_supply = max(total_supply, table["total_supply"])
+        
+        for row in table["tokens"]:
+            traits = {category: values[i]
+                      for category, values, i in zip(table["categories"], table["values"], row[1:])}
+            collection.append(lobster_record(row[0], traits, table["image_tiers"],
+                                             table["image_extension"], output_dir, table["layout"]))
+    
+    collection.sort(key=lambda lobster: lobster["token_id"])
+    token_ids = [lobster["token_id"] for lobster in collection]
+    if token_ids != list(range(1, total_supply + 1)):
+        missing = sorted(set(range(1, total_supply + 1)) - set(token_ids))
+        duplicates = len(token_ids) - len(set(token_ids))
+        raise ValueError(f"Trait tables do not cover the collection: {len(missing)} of "
+                         f"{total_supply} tokens missing (first: {missing[:5]}), "
+                         f"{duplicates} duplicated")
+    return first, collection
+
+def collection_encoding(table, output_format=None, compress_level=None, optimize=None):
+    """encode_image options to add tokens to (or re-render) a collection with
+    
+    Options left as None come from the encoding recorded in the collection's
+    trait table; options that differ from it raise ValueError, because the
+    new images wouldn't match the rest of the collection. Old tables without
+    a recorded encoding fall back to the defaults and only check the extension.
+    """
+    
+    recorded = table["encoding"]
+    encoding = dict(recorded or {"output_format": "png", "compress_level": None, "optimize": False})
+    given = {"output_format": output_format, "compress_level": compress_level, "optimize": optimize}
+    for option, value in given.items():
+        if value is None:
+            continue
+        if recorded is not None and value != recorded[option]:
+            raise ValueError(f"The collection's images were encoded with {option}={recorded[option]!r}, "
+                             f"not {value!r}")
+        encoding[option] = value
+    if image_extension(encoding["output_format"]) != table["image_extension"]:
+        raise ValueError(f"The collection's images are .{table['image_extension']}, "
+                         f"not {encoding['output_format']}")
+    return encoding
+
+def merge_collection(output_dir=DEFAULT_OUTPUT_DIR, rarity_method="weights", metadata_format=None,
+                     sink=None):
+    """Rank a sharded (or appended) collection as a whole from its trait tables
+    
+    Reads every trait_table*.json in output_dir (no images or per-token
+    JSON), checks that together they cover tokens 1..total_supply exactly
+    once, then ranks all tokens and writes the final metadata and
+    collection_summary.json. metadata_format picks the metadata sink (see
+    lobster_metadata.METADATA_FORMATS), by default the one the first trait
+    table recorded; sink is the output sink for the metadata (see
+    lobster_sinks.OUTPUT_SINKS), by default the directory layout the shards
+    were rendered with. Archive sinks write metadata.<zip|tar>.
+    """
+    
+    if rarity_method not in RARITY_METHODS:
+        raise ValueError(f"Unknown rarity method {rarity_method!r}")
+    if metadata_format is not None and metadata_format not in METADATA_FORMATS:
+        raise ValueError(f"Unknown metadata format {metadata_format!r}")
+    first, collection = load_trait_tables(output_dir)
+    total_supply = len(collection)
+    if metadata_format is None:
+        metadata_format = first["metadata_format"]
+    
+    if sink is None:
+        sink = "hashed" if first["layout"] == "hashed" else "files"
+    if sink not in OUTPUT_SINKS or OUTPUT_SINKS[sink]["layout"] != first["layout"]:
+        raise ValueError(f"Sink {sink!r} can't hold shards rendered with the {first['layout']} layout")
+    
+    print(f"📊 Calculating rarity ranks ({rarity_method})...")
+    collection = rank_collection(collection, rarity_method, trait_sampler)
+    
+    print("📄 Writing metadata...")
+    with open_sink(sink, output_dir, "metadata") as output:
+        metadata_location = write_metadata(collection, metadata_format, output_dir, sink=output)
+    index_dir = write_trait_index(collection, output_dir, rarity_method, trait_sampler,
+                                  first["image_extension"], first["layout"], metadata_format, sink)
+    
+    print("📋 Generating collection summary...")
+    summary = build_summary(collection, total_supply, first["seed"], rarity_method, first["image_tiers"])
+    summary_path = f"{output_dir}/collection_summary.json"
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    
+    print(f"✅ Collection summary saved to: {summary_path}")
+    print_collection_report(collection, summary, summary_path, output_dir, "COLLECTION MERGE COMPLETE!",
+                            index_dir, metadata_location, output)
+    
+    return collection, summary_path
+
+def iter_lobsters(token_ids, seed, workers=1, chunksize=None, encoding=None,
+                  writer_threads=0, queue_depth=16, stats=None, assigned_traits=None, tiers=None,
+                  cache=None):
+    """Yield (token_id, traits, {tier: encoded bytes}) in token order
+    
+    Tokens are processed in batches of chunksize; with workers > 1 each batch
+    runs in a worker process, with at most two batches per worker in flight
+    so a slow consumer never lets results pile up. Stage busy times are
+    added to stats if given (with the render cache hits and misses).
+    assigned_traits optionally holds the traits of every token, in order.
+    """
+    
+    # Batches amortize the IPC cost; results still come back in token order
+    num_lobsters = len(token_ids)
+    if chunksize is None:
+        chunksize = max(1, min(100, num_lobsters // (max(workers, 1) * 8)))
+    if assigned_traits is None:
+        assigned_traits = [None] * num_lobsters
+    tokens = list(zip(token_ids, assigned_traits))
+    batches = (tokens[i:i + chunksize] for i in range(0, num_lobsters, chunksize))
+    worker = partial(generate_lobster_batch, seed=seed, encoding=encoding,
+                     writer_threads=writer_threads, queue_depth=queue_depth, tiers=tiers, cache=cache)
+    
+    def consume(results):
+        for batch_results, batch_stats in results:
+            if stats is not None:
+                for stage, amount in batch_stats.items():
+                    stats[stage] = stats.get(stage, 0) + amount
+            yield from batch_results
+    
+    if workers <= 1:
+        yield from consume(map(worker, batches))
+        return
+    
+    def bounded_imap(pool):
+        pending = deque()
+        for batch in batches:
+            if len(pending) >= workers * 2:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(worker, (batch,)))
+        while pending:
+            yield pending.popleft().get()
+    
+    with Pool(workers) as pool:
+        yield from consume(bounded_imap(pool))
+
+def collection_tiers(tiers=None):
+    """Every image tier of a run; the full-size images are always the first"""
+    
+    all_tiers = {"images": w}
+    for tier, size in (tiers or {}).items():
+        if not TIER_NAME.fullmatch(tier) or tier in RESERVED_DIRS:
+            raise ValueError(f"Invalid image tier name {tier!r}: use letters, digits, _ and -, "
+                             f"and none of {', '.join(RESERVED_DIRS)}")
+        if size <= 0:
+            raise ValueError(f"Invalid image tier {tier}={size}")
+        all_tiers[tier] = size
+    return all_tiers
+
+def iter_collection(num_lobsters=1000, seed=None, workers=1, chunksize=None,
+                    output_format="png", compress_level=None, optimize=False,
+                    writer_threads=0, queue_depth=16, unique=False, tiers=None, shard=None,
+                    stats=None, layout="flat", cache=None, token_ids=None):
+    """Lazily generate a collection, one (token_id, traits, images, metadata) at a time
+    
+    images maps every tier to its encoded bytes and metadata is the token's
+    metadata without the rarity fields, which need the whole collection
+    (build_metadata adds them). Nothing is written to disk and only a few
+    batches are in flight, so memory stays constant however long the run and
+    callers can upload, archive or post-process tokens while rendering goes on:
+    
+        for token_id, traits, images, metadata in iter_collection(10000, seed=42):
+            upload(images["images"], metadata)
+    
+    layout (see lobster_sinks.layout_path) only decides the image paths in
+    the metadata and cache (a RenderCache) serves tokens rendered before.
+    token_ids replaces the range 1..num_lobsters (or the shard's slice of
+    it), e.g. to render tokens appended to a collection. Other arguments are
+    as for generate_collection, which consumes this iterator. Arguments are
+    checked (and unique traits assigned) when iter_collection is called;
+    the worker processes only start with the first token.
+    """
+    
+    encoding = {
+        "output_format": output_format,
+        "compress_level": compress_level,
+        "optimize": optimize,
+    }
+    extension = image_extension(output_format)
+    all_tiers = collection_tiers(tiers)
+    
+    # A collection seed makes the run reproducible regardless of worker count
+    if seed is None:
+        if shard is not None:
+            raise ValueError("Sharded runs need an explicit seed shared by every shard")
+        seed = random.randrange(2**32)
+    if token_ids is None:
+        token_ids = shard_token_ids(num_lobsters, shard)
+    elif unique:
+        raise ValueError("Unique mode assigns traits to the whole range 1..num_lobsters")
+    
+    # Unique mode assigns every token's traits up front, still driven by the seed
+    assigned_traits = None
+    if unique:
+        print("🧬 Assigning unique trait combinations...")
+        assigned_traits = trait_sampler.sample_unique(num_lobsters, random.Random(f"{seed}-unique"))
+        # Every shard draws the same assignment and keeps its own slice
+        assigned_traits = assigned_traits[token_ids.start - 1:token_ids.stop - 1]
+    
+    # Not a generator itself, so the checks above run before the first token is asked for
+    lobsters = iter_lobsters(token_ids, seed, workers, chunksize, encoding, writer_threads,
+                             queue_depth, stats, assigned_traits, all_tiers, cache)
+    return (
+        (token_id, traits, images,
+         token_metadata(lobster_record(token_id, traits, all_tiers, extension, layout=layout)))
+        for token_id, traits, images in lobsters
+    )
+
+def print_stage_report(stats, num_lobsters, wall_seconds):
+    """Print busy time and throughput of each generation stage"""
+    
+    print(f"\n⏱️  Stage throughput ({wall_seconds:.2f}s wall, "
+          f"{num_lobsters / max(wall_seconds, 1e-9):.1f} lobsters/s overall):")
+    for stage in STAGES:
+        seconds = stats[stage]
+        rate = num_lobsters / seconds if seconds else float("inf")
+        print(f"  {stage:<7} {seconds:8.2f}s busy  {rate:9.1f} lobsters/s per busy second")
+    lookups = stats.get("cache_hits", 0) + stats.get("cache_misses", 0)
+    if lookups:
+        print(f"🗃️  Render cache: {stats['cache_hits']} hits, {stats['cache_misses']} misses "
+              f"({stats['cache_hits'] / lookups:.0%} served from cache)")
+
+def evict_cache(cache, cache_mb):
+    """Trim the render cache after a run, returning how many images were evicted"""
+    
+    if cache is None:
+        return 0
+    evicted, evicted_bytes = cache.evict()
+    if evicted:
+        print(f"🧹 Evicted {evicted} cached images ({evicted_bytes / 1024 / 1024:.1f} MB) "
+              f"to keep the cache under {cache_mb} MB")
+    return evicted
+
+def render_cache_summary(cache, stats, evicted):
+    """Render cache section of a run summary"""
+    return {
+        "dir": cache.cache_dir,
+        "renderer_version": cache.version,
+        "hits": stats["cache_hits"],
+        "misses": stats["cache_misses"],
+        "evicted": evicted,
+    }
+
+def parse_shard(text):
+    """Parse a --shard value like "2/4" into (index, count), index counting from 1"""
+    index, _, count = text.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {text!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {index} is not in 1..{count}")
+    return index, count
+
+def parse_positive(text):
+    """Parse a count that must be at least 1 (--workers, --queue-depth)"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+def shard_token_ids(num_lobsters, shard=None):
+    """Token ids a shard renders: contiguous, near-equal ranges of 1..num_lobsters"""
+    if shard is None:
+        return range(1, num_lobsters + 1)
+    index, count = shard
+    return range(num_lobsters * (index - 1) // count + 1, num_lobsters * index // count + 1)
+
+def parse_tiers(text):
+    """Parse a --tiers value like "previews=512,thumbnails=128" into a dict"""
+    tiers = {}
+    for item in text.split(","):
+        tier, _, size = item.partition("=")
+        tiers[tier.strip()] = int(size)
+    return tiers
+
+def generate_collection(num_lobsters=1000, workers=1, seed=None, chunksize=None,
+                        output_format="png", compress_level=None, optimize=False,
+                        writer_threads=0, queue_depth=16, unique=False, rarity_method="weights",
+                        tiers=None, output_dir=DEFAULT_OUTPUT_DIR, shard=None, metadata_format="json",
+                        sink="files", cache_dir=None, cache_mb=DEFAULT_CACHE_MB):
+    """Generate the full NFT collection
+    
+    Consumes iter_collection, writing each token's images as they arrive,
+    then ranks the collection and writes metadata and the summary.
+    shard=(index, count) renders only that shard's token range (see
+    shard_token_ids), so several machines can split a collection. Each token
+    only depends on the seed and its token_id, so shards need a shared seed
+    but no coordination. A shard ranks its own tokens and writes
+    collection_summary.shard-<index>-of-<count>.json.
+    writer_threads > 0 enables pipeline mode (see generate_lobster_batch).
+    unique=True guarantees that no two tokens share the same trait combination.
+    rarity_method picks the scoring method (see lobster_rarity.RARITY_METHODS).
+    tiers adds extra image sizes, e.g. {"previews": 512, "thumbnails": 128};
+    each tier is rendered in the same pass into its own directory.
+    metadata_format picks the metadata sink: per-file "json" (default),
+    "json-compact", or one "jsonl" bundle (see lobster_metadata).
+    sink picks where images and metadata go: flat "files" directories,
+    "hashed" sharded directories, or one streamed "zip" or "tar" archive
+    (see lobster_sinks.OUTPUT_SINKS); the metadata image paths follow it.
+    cache_dir enables the render cache (see lobster_cache.RenderCache),
+    trimmed to cache_mb after the run; its hits and misses go in the summary.
+    The run records the fingerprints of the drawing code it used (see
+    lobster_impact), so rebuild_collection can later redo only what changed.
+    """
+    
+    extension = image_extension(output_format)
+    if rarity_method not in RARITY_METHODS:
+        raise ValueError(f"Unknown rarity method {rarity_method!r}")
+    if metadata_format not in METADATA_FORMATS:
+        raise ValueError(f"Unknown metadata format {metadata_format!r}")
+    if sink not in OUTPUT_SINKS:
+        raise ValueError(f"Unknown output sink {sink!r}")
+    layout = OUTPUT_SINKS[sink]["layout"]
+    all_tiers = collection_tiers(tiers)
+    cache = RenderCache(cache_dir, cache_mb * 1024 * 1024) if cache_dir is not None else None
+    
+    # Resolve the seed here so the summary can record it
+    if seed is None:
+        if shard is not None:
+            raise ValueError("Sharded runs need an explicit seed shared by every shard")
+        seed = random.randrange(2**32)
+    token_ids = shard_token_ids(num_lobsters, shard)
+    
+    if shard is None:
+        print(f"🦞 Generating {num_lobsters} Lobster NFTs...")
+    else:
+        print(f"🦞 Generating Lobster NFTs #{token_ids.start}-#{token_ids.stop - 1} "
+              f"(shard {shard[0]}/{shard[1]} of {num_lobsters})...")
+    print(f"📁 Output directory: {output_dir}")
+    print(f"🎲 Seed: {seed}  ⚙️  Workers: {workers}  🖼️  Format: {output_format}")
+    print("=" * 60)
+    
+    collection = []
+    
+    # Images are written as they stream in; ranking waits for the last token
+    suffix = "" if shard is None else f".shard-{shard[0]}-of-{shard[1]}"
+    stats = dict.fromkeys(STAGES, 0.0)
+    start = time.perf_counter()
+    lobsters = iter_collection(num_lobsters, seed, workers, chunksize, output_format, compress_level,
+                               optimize, writer_threads, queue_depth, unique, tiers, shard, stats, layout,
+                               cache)
+    with open_sink(sink, output_dir, f"collection{suffix}") as output:
+        for token_id, traits, images, _ in lobsters:
+            lobster = lobster_record(token_id, traits, all_tiers, extension, output_dir, layout)
+            collection.append(save_lobster(lobster, images, stats, output))
+            
+            # Progress updates
+            if len(collection) % 50 == 0:
+                print(f"✓ Generated {len(collection)}/{len(token_ids)} lobsters...")
+        
+        print("=" * 60)
+        print(f"✅ All {len(token_ids)} lobsters generated!")
+        print_stage_report(stats, len(token_ids), time.perf_counter() - start)
+        evicted = evict_cache(cache, cache_mb)
+        
+        # Score the whole collection and sort by rarity rank
+        print(f"\n📊 Calculating rarity ranks ({rarity_method})...")
+        collection = rank_collection(collection, rarity_method, trait_sampler)
+        
+        # Write metadata with rarity ranks (single pass, records are in memory)
+        print("📄 Writing metadata...")
+        metadata_location = write_metadata(collection, metadata_format, output_dir, f"metadata{suffix}",
+                                           output)
+    encoding = {"output_format": output_format, "compress_level": compress_level, "optimize": optimize}
+    write_trait_table(collection, output_dir, seed, num_lobsters, all_tiers, extension, shard, layout,
+                      unique=unique, sink=sink, metadata_format=metadata_format, encoding=encoding)
+    write_fingerprints(output_dir)
+    # Shards only index once merged, when global ranks are known
+    index_dir = None
+    if shard is None:
+        index_dir = write_trait_index(collection, output_dir, rarity_method, trait_sampler, extension,
+                                      layout, metadata_format, sink)
+    
+    # Generate collection summary
+    print("📋 Generating collection summary...")
+    summary = build_summary(collection, num_lobsters, seed, rarity_method, all_tiers)
+    summary_path = f"{output_dir}/collection_summary.json"
+    if cache is not None:
+        summary["render_cache"] = render_cache_summary(cache, stats, evicted)
+    if shard is not None:
+        summary["shard"] = {
+            "index": shard[0],
+            "count": shard[1],
+            "first_token": token_ids.start,
+            "last_token": token_ids.stop - 1,
+        }
+        summary_path = f"{output_dir}/collection_summary{suffix}.json"
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    
+    print(f"✅ Collection summary saved to: {summary_path}")
+    print_collection_report(collection, summary, summary_path, output_dir, "COLLECTION GENERATION COMPLETE!",
+                            index_dir, metadata_location, output)
     
     return collection, summary_path
 
+def append_collection(num_new, output_dir=DEFAULT_OUTPUT_DIR, workers=1, chunksize=None,
+                      output_format=None, compress_level=None, optimize=None,
+                      writer_threads=0, queue_depth=16, rarity_method="weights",
+                      metadata_format=None, cache_dir=None, cache_mb=DEFAULT_CACHE_MB):
+    """Add num_new tokens to an existing collection, updating ranks incrementally
+    
+    The new tokens continue the token range with the collection's seed,
+    tiers, encoding, sink and metadata format (read from its trait tables
+    and index; see collection_encoding, and archive sinks can't be appended
+    to), so they are exactly the
+    tokens a bigger run would have drawn. The existing scores and ranks come
+    from the trait index. With the "weights" method the new scores are
+    inserted into that order (see lobster_rarity.insert_ranks); the other
+    methods depend on trait frequencies, so the whole collection is rescored.
+    Per-file metadata is only rewritten for the new tokens and for existing
+    tokens whose score, rank or percentile changed. The new tokens get their
+    own trait table, so merge_collection still sees the whole collection.
+    """
+    
+    if num_new <= 0:
+        raise ValueError(f"Nothing to append ({num_new} tokens)")
+    first, collection = load_trait_tables(output_dir)
+    total_before = len(collection)
+    if first["unique"]:
+        raise ValueError("New tokens can't be kept unique against a collection generated with --unique")
+    encoding = collection_encoding(first, output_format, compress_level, optimize)
+    
+    # Copy the old scores and ranks out before the index files are rewritten
+    index = TraitIndex(output_dir)
+    if len(index) != total_before:
+        raise ValueError(f"The trait index covers {len(index)} of {total_before} tokens; run --merge first")
+    if index.header["rarity_method"] != rarity_method:
+        raise ValueError(f"The collection is ranked with {index.header['rarity_method']!r}; "
+                         f"append with the same rarity method")
+    # A merge may have rewritten the metadata since the tables were written
+    sink = index.header.get("sink", first["sink"])
+    for name in (first["sink"], sink):
+        if OUTPUT_SINKS[name]["archive"]:
+            raise ValueError(f"The collection was written to a {name} archive, which can't be appended to; "
+                             f"run it again with the new --count")
+    recorded_format = index.header.get("metadata_format", first["metadata_format"])
+    if metadata_format is None:
+        metadata_format = recorded_format
+    elif metadata_format != recorded_format:
+        raise ValueError(f"The collection's metadata is {recorded_format!r}; "
+                         f"append with the same metadata format")
+    old_scores = [float(score) for score in index.columns["score"]]
+    old_ranks = [int(rank) for rank in index.columns["rank"]]
+    del index
+    
+    seed = first["seed"]
+    layout = first["layout"]
+    image_tiers = first["image_tiers"]
+    token_ids = range(total_before + 1, total_before + num_new + 1)
+    total_supply = total_before + num_new
+    cache = RenderCache(cache_dir, cache_mb * 1024 * 1024) if cache_dir is not None else None
+    
+    print(f"➕ Appending Lobster NFTs #{token_ids.start}-#{token_ids.stop - 1} "
+          f"to the {total_before} in {output_dir}...")
+    print(f"🎲 Seed: {seed}  ⚙️  Workers: {workers}  🖼️  Format: {encoding['output_format']}")
+    print("=" * 60)
+    
+    added = []
+    stats = dict.fromkeys(STAGES, 0.0)
+    start = time.perf_counter()
+    tiers = {tier: size for tier, size in image_tiers.items() if tier != "images"}
+    lobsters = iter_collection(total_supply, seed, workers, chunksize, encoding["output_format"],
+                               encoding["compress_level"], encoding["optimize"], writer_threads,
+                               queue_depth, False, tiers, None, stats, layout, cache, token_ids)
+    with open_sink(sink, output_dir) as output:
+        for token_id, traits, images, _ in lobsters:
+            lobster = lobster_record(token_id, traits, image_tiers, first["image_extension"], output_dir,
+                                     layout)
+            added.append(save_lobster(lobster, images, stats, output))
+            
+            # Progress updates
+            if len(added) % 50 == 0:
+                print(f"✓ Generated {len(added)}/{num_new} lobsters...")
+        
+        print("=" * 60)
+        print(f"✅ All {num_new} new lobsters generated!")
+        print_stage_report(stats, num_new, time.perf_counter() - start)
+        evicted = evict_cache(cache, cache_mb)
+        
+        print(f"\n📊 Updating rarity ranks ({rarity_method})...")
+        if rarity_method == "weights":
+            # Scores don't depend on the collection: only the new ones need computing
+            rank_collection(added, rarity_method, trait_sampler)
+            ranks, new_ranks = insert_ranks(old_scores, old_ranks,
+                                            [lobster["rarity_score"] for lobster in added],
+                                            [lobster["token_id"] for lobster in added])
+            for lobster, score, rank in zip(collection, old_scores, ranks):
+                lobster["rarity_score"] = int(score) if score.is_integer() else score
+                lobster["rarity_rank"] = int(rank)
+            for lobster, rank in zip(added, new_ranks):
+                lobster["rarity_rank"] = int(rank)
+            ranked = sorted(collection + added, key=lambda lobster: lobster["rarity_rank"])
+        else:
+            ranked = rank_collection(collection + added, rarity_method, trait_sampler)
+        
+        changed = {
+            lobster["token_id"]
+            for lobster, score, rank in zip(collection, old_scores, old_ranks)
+            if lobster["rarity_score"] != score or lobster["rarity_rank"] != rank
+            or rarity_percentile(lobster["rarity_rank"], total_supply) != rarity_percentile(rank, total_before)
+        }
+        
+        print("📄 Writing metadata...")
+        rewrite = changed | set(token_ids)
+        metadata_location = write_metadata(ranked, metadata_format, output_dir, sink=output,
+                                           token_ids=rewrite)
+    
+    write_trait_table(added, output_dir, seed, total_supply, image_tiers, first["image_extension"],
+                      layout=layout, appended=token_ids, sink=sink, metadata_format=metadata_format,
+                      encoding=encoding)
+    index_dir = write_trait_index(ranked, output_dir, rarity_method, trait_sampler,
+                                  first["image_extension"], layout, metadata_format, sink)
+    
+    print("📋 Generating collection summary...")
+    summary = build_summary(ranked, total_supply, seed, rarity_method, image_tiers)
+    summary["append"] = {
+        "first_token": token_ids.start,
+        "last_token": token_ids.stop - 1,
+        "existing_metadata_rewritten": len(changed),
+        "existing_metadata_unchanged": total_before - len(changed),
+    }
+    if cache is not None:
+        summary["render_cache"] = render_cache_summary(cache, stats, evicted)
+    summary_path = f"{output_dir}/collection_summary.json"
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    
+    print(f"♻️  Rewrote the metadata of {len(changed)} of {total_before} existing lobsters "
+          f"(score, rank or percentile changed) and wrote {num_new} new ones")
+    print(f"✅ Collection summary saved to: {summary_path}")
+    print_collection_report(ranked, summary, summary_path, output_dir, "COLLECTION APPEND COMPLETE!",
+                            index_dir, metadata_location, output)
+    
+    return ranked, summary_path
+
+def rebuild_collection(output_dir=DEFAULT_OUTPUT_DIR, workers=1, chunksize=None, output_format=None,
+                       compress_level=None, optimize=None, writer_threads=0, queue_depth=16,
+                       cache_dir=None, cache_mb=DEFAULT_CACHE_MB, dry_run=False):
+    """Re-render only the tokens an edit to the drawing code or TRAITS affects
+    
+    Diffs the fingerprints recorded by the last build against the current
+    code (see lobster_impact), looks the changed trait values up in the
+    trait index, and re-renders and re-encodes just those tokens into their
+    image tiers; e.g. only the lobsters with a Crown after editing
+    draw_crown. Traits, ranks and metadata don't change, and the images are
+    encoded the way the collection was (see collection_encoding). dry_run
+    only reports what would be rebuilt. Returns the rebuilt token ids.
+    """
+    
+    first, collection = load_trait_tables(output_dir)
+    encoding = collection_encoding(first, output_format, compress_level, optimize)
+    if OUTPUT_SINKS[first["sink"]]["archive"]:
+        raise ValueError(f"The collection's images are in a {first['sink']} archive; archived collections "
+                         f"need a full run")
+    index = TraitIndex(output_dir)
+    if len(index) != len(collection):
+        raise ValueError(f"The trait index covers {len(index)} of {len(collection)} tokens; "
+                         f"run --merge first")
+    
+    fingerprints = render_fingerprints()
+    token_ids, changes = affected_tokens(index, load_fingerprints(output_dir), fingerprints)
+    del index
+    print(f"🔍 Changed since the last build: {', '.join(changes) or 'nothing'}")
+    print(f"♻️  {len(token_ids)} of {len(collection)} lobsters need re-rendering "
+          f"({len(token_ids) / len(collection):.1%})")
+    if dry_run or not token_ids:
+        return token_ids
+    
+    records = [collection[token_id - 1] for token_id in token_ids]
+    # Unique collections rendered their assigned traits; the others drew them from the seed
+    assigned_traits = [lobster["traits"] for lobster in records] if first["unique"] else None
+    cache = RenderCache(cache_dir, cache_mb * 1024 * 1024) if cache_dir is not None else None
+    print("=" * 60)
+    
+    stats = dict.fromkeys(STAGES, 0.0)
+    start = time.perf_counter()
+    lobsters = iter_lobsters(token_ids, first["seed"], workers, chunksize, encoding, writer_threads,
+                             queue_depth, stats, assigned_traits, first["image_tiers"], cache)
+    with open_sink(first["sink"], output_dir) as output:
+        for done, (lobster, (token_id, traits, images)) in enumerate(zip(records, lobsters), 1):
+            if traits != lobster["traits"]:
+                raise ValueError(f"Lobster #{token_id} no longer draws the traits in its trait table; "
+                                 f"regenerate the collection instead")
+            save_lobster(lobster, images, stats, output)
+            
+            # Progress updates
+            if done % 50 == 0:
+                print(f"✓ Rebuilt {done}/{len(records)} lobsters...")
+    
+    print("=" * 60)
+    print(f"✅ Rebuilt {len(records)} lobsters!")
+    print_stage_report(stats, len(records), time.perf_counter() - start)
+    evict_cache(cache, cache_mb)
+    write_fingerprints(output_dir, fingerprints)
+    return token_ids
+
 if __name__ == "__main__":
-    collection, summary_path = generate_collection(num_lobsters=1000)
+    parser = argparse.ArgumentParser(description="Generate the Lobster NFT collection")
+    parser.add_argument("--count", type=int, default=1000,
+                        help="number of lobsters in the collection (default: 1000)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help=f"collection output directory (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("--shard", type=parse_shard, default=None, metavar="i/N",
+                        help="only render shard i of N (1-based) of the token range; needs --seed")
+    parser.add_argument("--workers", type=parse_positive, default=1,
+                        help="number of worker processes (default: 1)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="collection seed for reproducible output (default: random)")
+    parser.add_argument("--format", dest="output_format", default=None, choices=list(OUTPUT_FORMATS),
+                        help="image output format (default: png; with --append or --rebuild, the "
+                             "collection's own, as for the two options below)")
+    parser.add_argument("--compress-level", type=int, default=None, choices=range(10),
+                        metavar="0-9", help="PNG zlib compression level (default: Pillow's 6)")
+    parser.add_argument("--optimize", action="store_true", default=None,
+                        help="let the PNG encoder search for the smallest output")
+    parser.add_argument("--writer-threads", type=int, default=0,
+                        help="pipeline mode: threads that encode images while rendering continues (default: 0, off)")
+    parser.add_argument("--queue-depth", type=parse_positive, default=16,
+                        help="pipeline mode: max rendered images waiting for an encoder (default: 16)")
+    parser.add_argument("--unique", action="store_true",
+                        help="never give two lobsters the same trait combination")
+    parser.add_argument("--rarity-method", default="weights", choices=list(RARITY_METHODS),
+                        help="rarity scoring method (default: weights)")
+    parser.add_argument("--tiers", type=parse_tiers, default=None, metavar="NAME=SIZE,...",
+                        help="extra image sizes rendered in the same pass, e.g. previews=512,thumbnails=128")
+    parser.add_argument("--metadata", dest="metadata_format", default=None, choices=list(METADATA_FORMATS),
+                        help="metadata sink: one indented file per token, compact files, or a single "
+                             "JSONL bundle with an offset index (default: json; with --append or "
+                             "--merge, the collection's own)")
+    parser.add_argument("--sink", default=None, choices=list(OUTPUT_SINKS),
+                        help="where images and metadata go: flat directories, hashed sharded directories "
+                             "(images/3a/1234.png), or one streamed zip/tar archive (default: files; "
+                             "with --merge, the layout the shards used)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="reuse encoded images from this render cache and add new renders to it (default: off)")
+    parser.add_argument("--cache-mb", type=int, default=DEFAULT_CACHE_MB,
+                        help=f"render cache size limit, least recently used images are evicted (default: {DEFAULT_CACHE_MB})")
+    parser.add_argument("--append", type=int, default=None, metavar="N",
+                        help="don't regenerate; add N tokens to the collection in --output-dir and only "
+                             "rewrite the metadata whose rank changed")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="don't regenerate; re-render only the tokens in --output-dir that edits to the "
+                             "drawing code or TRAITS affect since the last build")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="with --rebuild, only report which tokens would be re-rendered")
+    parser.add_argument("--merge", action="store_true",
+                        help="don't render; rank the shards in --output-dir as one collection and "
+                             "write the final metadata and summary")
+    args = parser.parse_args()
+    if args.merge:
+        merge_collection(args.output_dir, args.rarity_method, args.metadata_format, args.sink)
+    elif args.rebuild:
+        rebuild_collection(
+            output_dir=args.output_dir,
+            workers=args.workers,
+            output_format=args.output_format,
+            compress_level=args.compress_level,
+            optimize=args.optimize,
+            writer_threads=args.writer_threads,
+            queue_depth=args.queue_depth,
+            cache_dir=args.cache_dir,
+            cache_mb=args.cache_mb,
+            dry_run=args.dry_run,
+        )
+    elif args.append is not None:
+        append_collection(
+            args.append,
+            output_dir=args.output_dir,
+            workers=args.workers,
+            output_format=args.output_format,
+            compress_level=args.compress_level,
+            optimize=args.optimize,
+            writer_threads=args.writer_threads,
+            queue_depth=args.queue_depth,
+            rarity_method=args.rarity_method,
+            metadata_format=args.metadata_format,
+            cache_dir=args.cache_dir,
+            cache_mb=args.cache_mb,
+        )
+    else:
+        if args.shard is not None and args.seed is None:
+            parser.error("--shard needs --seed so every shard renders the same collection")
+        
+        collection, summary_path = generate_collection(
+            num_lobsters=args.count,
+            workers=args.workers,
+            seed=args.seed,
+            output_format=args.output_format or "png",
+            compress_level=args.compress_level,
+            optimize=bool(args.optimize),
+            writer_threads=args.writer_threads,
+            queue_depth=args.queue_depth,
+            unique=args.unique,
+            rarity_method=args.rarity_method,
+            tiers=args.tiers,
+            output_dir=args.output_dir,
+            shard=args.shard,
+            metadata_format=args.metadata_format or "json",
+            sink=args.sink or "files",
+            cache_dir=args.cache_dir,
+            cache_mb=args.cache_mb,
+        )
@@ -0,0 +1,134 @@
+from functools import lru_cache
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import threading
+
+import PIL
+
+# Modules whose code decides the pixels (or SVG) of a token; editing any of
+# them changes the renderer version and so every cache key
+RENDERER_MODULES = ("simple_lobster", "lobster_layers", "lobster_encoders", "lobster_svg")
+
+DEFAULT_CACHE_MB = 1024
+
+@lru_cache(maxsize=None)
+def renderer_version():
+    """Short hash of the drawing code and the Pillow version"""
+    
+    digest = hashlib.sha256(PIL.__version__.encode())
+    for name in RENDERER_MODULES:
+        with open(importlib.import_module(name).__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+class RenderCache:
+    """On-disk, content-addressed cache of encoded token images
+    
+    Entries are keyed by a hash of everything that decides the encoded bytes:
+    the background color, the token's layers with their random details (see
+    simple_lobster.lobster_layers), the image size, the reference canvas the
+    size is scaled against, the encoding options and the renderer version. A token rendered before (in any run, with any
+    collection size) is read back instead of drawn and encoded again, and
+    tokens with identical art share one entry. Every
+    hit refreshes the entry's mtime; evict() then deletes the least recently
+    used entries until the cache fits in max_bytes. The cache is safe to
+    share between worker processes (entries are written atomically).
+    """
+    
+    def __init__(self, cache_dir, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024, version=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version = version or renderer_version()
+    
+    def key(self, bg_color, layers, size, encoding=None, canvas=None):
+        encoding = encoding or {}
+        payload = [
+            self.version,
+            bg_color,
+            layers,
+            size,
+            list(canvas) if canvas is not None else None,
+            encoding.get("output_format", "png"),
+            encoding.get("compress_level"),
+            bool(encoding.get("optimize")),
+        ]
+        return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+    
+    def path(self, key):
+        return f"{self.cache_dir}/{key[:2]}/{key}"
+    
+    def get(self, key):
+        """Cached bytes for key, or None"""
+        
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass  # evicted by another process meanwhile
+        return data
+    
+    def put(self, key, data):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    
+    def entries(self):
+        """(mtime, size, path) of every cached file"""
+        
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for bucket in os.scandir(self.cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+    
+    def evict(self):
+        """Delete least recently used entries until the cache fits; returns (files, bytes) removed"""
+        
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = removed_bytes = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+            removed_bytes += size
+        return removed, removed_bytes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or trim a render cache")
+    parser.add_argument("cache_dir", help="render cache directory")
+    parser.add_argument("--max-mb", type=int, default=None,
+                        help="evict least recently used entries down to this size")
+    args = parser.parse_args()
+    
+    cache = RenderCache(args.cache_dir)
+    if args.max_mb is not None:
+        cache.max_bytes = args.max_mb * 1024 * 1024
+        removed, removed_bytes = cache.evict()
+        print(f"🧹 Evicted {removed} entries ({removed_bytes / 1024 / 1024:.1f} MB)")
+    entries = cache.entries()
+    print(f"🗃️  {len(entries)} cached images, {sum(size for _, size, _ in entries) / 1024 / 1024:.1f} MB "
+          f"(renderer version {cache.version})")
@@ -0,0 +1,140 @@
+from PIL import Image, features
+from functools import lru_cache
+import argparse
+import io
+import random
+import time
+
+from simple_lobster import TRAITS, generate_traits
+from lobster_layers import draw_layered_lobster, iter_layer_args, render_layer
+
+# Output formats for the generated art
+#   png          - 24-bit RGB PNG (the classic output)
+#   png-palette  - 8-bit palette PNG with the exact lobster palette (lossless)
+#   webp         - lossless WebP
+#   svg          - vector SVG drawn from the display lists (no rasterizing)
+OUTPUT_FORMATS = {
+    "png": {"extension": "png", "palette": False, "vector": False},
+    "png-palette": {"extension": "png", "palette": True, "vector": False},
+    "webp": {"extension": "webp", "palette": False, "vector": False},
+    "svg": {"extension": "svg", "palette": False, "vector": True},
+}
+
+def image_extension(output_format):
+    """File extension used for an output format"""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format!r} "
+                         f"(choose from {', '.join(OUTPUT_FORMATS)})")
+    return OUTPUT_FORMATS[output_format]["extension"]
+
+@lru_cache(maxsize=None)
+def lobster_palette():
+    """Palette image holding every color the renderer can produce
+    
+    Built from the TRAITS background colors plus the colors found in every
+    trait layer sprite, so converting a lobster to it is lossless.
+    """
+    
+    colors = {option["color"] for option in TRAITS["Background"].values()}
+    for layer, args in iter_layer_args():
+        sprite, _ = render_layer(layer, args)
+        if sprite is None:
+            continue
+        for _, (r, g, b, a) in sprite.getcolors(maxcolors=sprite.width * sprite.height):
+            if a == 255:
+                colors.add((r, g, b))
+    
+    if len(colors) > 256:
+        raise ValueError(f"Lobster art uses {len(colors)} colors, too many for a palette PNG")
+    
+    palette = [channel for color in sorted(colors) for channel in color]
+    palette += palette[:3] * (256 - len(colors))
+    palette_img = Image.new('P', (1, 1))
+    palette_img.putpalette(palette)
+    return palette_img
+
+def is_vector_format(output_format):
+    """True for formats rendered as SVG documents instead of images"""
+    image_extension(output_format)  # validates the format name
+    return OUTPUT_FORMATS[output_format]["vector"]
+
+def encode_image(img, fp, output_format="png", compress_level=None, optimize=False):
+    """Encode an RGB lobster image (an SVG document for vector formats) to a file object"""
+    
+    if is_vector_format(output_format):
+        fp.write(img.encode("utf-8"))
+        return
+    
+    if output_format == "webp":
+        img.save(fp, format="WEBP", lossless=True, quality=100, method=4)
+        return
+    
+    if OUTPUT_FORMATS[output_format]["palette"]:
+        img = img.quantize(palette=lobster_palette(), dither=Image.Dither.NONE)
+    params = {"optimize": optimize}
+    if compress_level is not None:
+        params["compress_level"] = compress_level
+    img.save(fp, format="PNG", **params)
+
+def encoder_report(num_samples=10, seed=0, size=1400):
+    """Compare encode time and bytes per image for every output option"""
+    
+    options = [
+        ("png", {}),
+        ("png", {"compress_level": 1}),
+        ("png", {"compress_level": 9}),
+        ("png", {"optimize": True}),
+        ("png-palette", {}),
+        ("png-palette", {"compress_level": 1}),
+        ("png-palette", {"compress_level": 9}),
+        ("png-palette", {"optimize": True}),
+    ]
+    if features.check("webp"):
+        options.append(("webp", {}))
+    
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(num_samples):
+        traits = generate_traits(rng)
+        bg_color = TRAITS["Background"][traits["Background"]]["color"]
+        img = Image.new('RGB', (size, size), bg_color)
+        draw_layered_lobster(img, size / 2, size / 2, traits, rng=rng)
+        samples.append(img)
+    
+    # Build the palette up front so it doesn't count towards encode time
+    lobster_palette()
+    
+    print(f"🧪 Encoder report ({num_samples} lobsters, {size}x{size}px)")
+    print("=" * 60)
+    print(f"{'format':<14}{'options':<22}{'ms/image':>10}{'KB/image':>12}")
+    report = []
+    for output_format, params in options:
+        total_bytes = 0
+        start = time.perf_counter()
+        for img in samples:
+            buffer = io.BytesIO()
+            encode_image(img, buffer, output_format, **params)
+            total_bytes += buffer.tell()
+        elapsed = time.perf_counter() - start
+        
+        row = {
+            "format": output_format,
+            "options": params,
+            "ms_per_image": round(elapsed / num_samples * 1000, 2),
+            "bytes_per_image": total_bytes // num_samples,
+        }
+        report.append(row)
+        label = ", ".join(f"{k}={v}" for k, v in params.items()) or "default"
+        print(f"{output_format:<14}{label:<22}{row['ms_per_image']:>10.2f}"
+              f"{row['bytes_per_image'] / 1024:>12.1f}")
+    print("=" * 60)
+    
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare image encoders for lobster art")
+    parser.add_argument("--samples", type=int, default=10, help="number of lobsters to encode")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the sample lobsters")
+    args = parser.parse_args()
+    
+    encoder_report(num_samples=args.samples, seed=args.seed)
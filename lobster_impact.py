@@ -0,0 +1,208 @@
+from itertools import product
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import os
+
+import PIL
+
+from lobster_cache import RENDERER_MODULES
+from lobster_index import TraitIndex
+from simple_lobster import (
+    TRAITS, LAYER_VARIANTS, w, h, compile_layer, lobster_layers, replay_display_list,
+)
+
+# Trait categories each layer of lobster_layers is drawn from; the last one
+# is the trait the layer belongs to, the shell color tints every layer
+LAYER_TRAITS = {
+    "tail": ("Shell Color", "Tail"),
+    "body": ("Shell Color",),
+    "eyes": ("Shell Color", "Eyes"),
+    "claws": ("Shell Color", "Claw Size"),
+    "accessory": ("Shell Color", "Accessory"),
+}
+
+# The background is a flat frame color rather than a layer
+BACKGROUND = "Background"
+
+FINGERPRINTS_FILE = "render_fingerprints.json"
+
+class VariantPicker:
+    """Stands in for a token's generator and always picks the same layer variant"""
+    
+    def __init__(self, variant):
+        self.variant = variant
+    
+    def randrange(self, stop):
+        return self.variant % stop
+
+def trait_config(category, value):
+    """A trait's TRAITS entry without its rarity, which doesn't change any pixel"""
+    return {key: option for key, option in TRAITS[category][value].items() if key != "rarity"}
+
+def piece_fingerprint(layer, traits):
+    """Hash of the config entries of traits and every display list they give layer"""
+    
+    digest = hashlib.sha256(layer.encode())
+    for category, value in traits.items():
+        digest.update(json.dumps([category, value, trait_config(category, value)]).encode())
+    if layer == "background":
+        return digest.hexdigest()[:16]
+    
+    # Every seeded variant (spots, googly pupils) of the layer
+    base = {category: next(iter(options)) for category, options in TRAITS.items()}
+    base.update(traits)
+    variants = {dict(lobster_layers(base, VariantPicker(variant)))[layer]
+                for variant in range(LAYER_VARIANTS)}
+    for args in sorted(variants, key=repr):
+        digest.update(repr(compile_layer(layer, args)).encode())
+    return digest.hexdigest()[:16]
+
+def renderer_fingerprint():
+    """Hash of the code every token goes through, whatever its traits
+    
+    Covers the rasterizing, compositing and encoding modules (simple_lobster
+    is fingerprinted per trait instead), the display list replay, the
+    canvas size SVGs are drawn on, the generator's canvas every raster tier
+    is scaled against, and the Pillow version.
+    """
+    
+    # Imported here: the generator imports this module
+    from generate_1000_lobsters import w as tier_w, h as tier_h
+    digest = hashlib.sha256(f"{PIL.__version__}-{w}x{h}-{tier_w}x{tier_h}".encode())
+    digest.update(inspect.getsource(replay_display_list).encode())
+    for name in RENDERER_MODULES:
+        if name == "simple_lobster":
+            continue
+        with open(importlib.import_module(name).__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def weights_fingerprint():
+    """Hash of the trait values and rarities, which decide every token's traits"""
+    
+    weights = [[category, value, options["rarity"]]
+               for category, values in TRAITS.items() for value, options in values.items()]
+    return hashlib.sha256(json.dumps(weights).encode()).hexdigest()[:16]
+
+def render_fingerprints():
+    """Fingerprints of the current drawing code and TRAITS
+    
+    Every piece is one layer for one combination of the traits it is drawn
+    from (e.g. the accessory layer for a Blue shell with a Crown), or one
+    background color, so an edit only touches the pieces it really changes.
+    """
+    
+    pieces = [{"layer": "background", "traits": {BACKGROUND: value},
+               "fingerprint": piece_fingerprint("background", {BACKGROUND: value})}
+              for value in TRAITS[BACKGROUND]]
+    for layer, categories in LAYER_TRAITS.items():
+        for values in product(*(TRAITS[category] for category in categories)):
+            traits = dict(zip(categories, values))
+            pieces.append({"layer": layer, "traits": traits,
+                           "fingerprint": piece_fingerprint(layer, traits)})
+    return {
+        "renderer": renderer_fingerprint(),
+        "weights": weights_fingerprint(),
+        "pieces": pieces,
+    }
+
+def fingerprints_path(output_dir):
+    return f"{output_dir}/{FINGERPRINTS_FILE}"
+
+def write_fingerprints(output_dir, fingerprints=None):
+    """Record what a collection was rendered with, for the next rebuild to diff against"""
+    
+    if fingerprints is None:
+        fingerprints = render_fingerprints()
+    with open(fingerprints_path(output_dir), 'w') as f:
+        json.dump(fingerprints, f, indent=1)
+    return fingerprints
+
+def load_fingerprints(output_dir):
+    """Fingerprints of the last build, or None if it didn't record any"""
+    
+    path = fingerprints_path(output_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def changed_pieces(old, new):
+    """Pieces of new whose fingerprint differs from (or is missing in) old"""
+    
+    previous = {(piece["layer"], json.dumps(piece["traits"])): piece["fingerprint"]
+                for piece in old["pieces"]}
+    return [piece for piece in new["pieces"]
+            if previous.get((piece["layer"], json.dumps(piece["traits"]))) != piece["fingerprint"]]
+
+def describe_changes(pieces, new):
+    """Readable summary of the changed pieces
+    
+    A trait value is named ("Accessory=Crown") when every piece drawn with it
+    changed; other changed pieces are listed one by one ("accessory[...]").
+    """
+    
+    if len(pieces) == len(new["pieces"]):
+        return ["every trait"]
+    changed = {(piece["layer"], json.dumps(piece["traits"])) for piece in pieces}
+    unchanged_values = {(category, value) for piece in new["pieces"]
+                        if (piece["layer"], json.dumps(piece["traits"])) not in changed
+                        for category, value in piece["traits"].items()}
+    
+    changes = []
+    for piece in pieces:
+        values = [(category, value) for category, value in piece["traits"].items()
+                  if (category, value) not in unchanged_values]
+        if values:
+            changes.extend(f"{category}={value}" for category, value in values
+                           if f"{category}={value}" not in changes)
+        else:
+            traits = ", ".join(f"{category}={value}" for category, value in piece["traits"].items())
+            changes.append(f"{piece['layer']}[{traits}]")
+    return changes
+
+def affected_tokens(index, old, new=None):
+    """Token ids whose images the changes from old to new fingerprints touch
+    
+    index is the collection's TraitIndex, which maps trait values to the
+    tokens that use them. Returns (token ids in order, changed trait values);
+    with no old fingerprints or a changed renderer every token is affected.
+    Raises ValueError when the rarity weights changed, because then the
+    tokens would draw different traits and the collection needs regenerating.
+    """
+    
+    if new is None:
+        new = render_fingerprints()
+    if old is not None and old["weights"] != new["weights"]:
+        raise ValueError("The trait rarities changed since the last build, so every token would "
+                         "draw different traits: regenerate the collection instead")
+    everything = index.query({})
+    if old is None:
+        return everything, ["no fingerprints from the last build"]
+    if old["renderer"] != new["renderer"]:
+        return everything, ["renderer"]
+    
+    pieces = changed_pieces(old, new)
+    token_ids = set()
+    for piece in pieces:
+        # Trait values added since the build can't be used by any token yet
+        if all(value in index.values[category] for category, value in piece["traits"].items()):
+            token_ids.update(index.query(piece["traits"]))
+    return sorted(token_ids), describe_changes(pieces, new)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List the tokens a drawing or TRAITS edit affects")
+    parser.add_argument("collection_dir", help="collection output directory (with index/)")
+    parser.add_argument("--tokens", action="store_true", help="print the affected token ids")
+    args = parser.parse_args()
+    
+    index = TraitIndex(args.collection_dir)
+    token_ids, changes = affected_tokens(index, load_fingerprints(args.collection_dir))
+    print(f"🔍 Changed since the last build: {', '.join(changes) or 'nothing'}")
+    print(f"♻️  {len(token_ids)} of {len(index)} lobsters need re-rendering "
+          f"({len(token_ids) / max(len(index), 1):.1%})")
+    if args.tokens:
+        print(" ".join(str(token_id) for token_id in token_ids))
@@ -0,0 +1,212 @@
+from array import array
+import argparse
+import json
+import mmap
+import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, queries fall back to plain loops
+    np = None
+
+from lobster_sampler import TraitSampler
+
+# Column name -> array typecode (all columns little-endian, one row per token)
+#   token_id  - uint32
+#   score     - float64 rarity score
+#   rank      - uint32 rarity rank (1 = rarest)
+#   <category> - uint8 index into the category's values
+INDEX_COLUMNS = {"token_id": "I", "score": "d", "rank": "I"}
+TRAIT_TYPECODE = "B"
+
+def column_filename(name):
+    return name.lower().replace(" ", "_") + ".bin"
+
+def write_trait_index(ranked, output_dir, rarity_method="weights", sampler=None, image_extension="png",
+                      layout="flat", metadata_format="json", sink="files"):
+    """Write the columnar trait index of a ranked collection to output_dir/index
+    
+    Rows are in token_id order. Each column is a packed little-endian file
+    next to an index.json header, so the index can be memory-mapped and
+    queried without touching per-token metadata. The header also records the
+    metadata format and sink the metadata was last written with.
+    """
+    
+    if sampler is None:
+        sampler = TraitSampler()
+    index_dir = f"{output_dir}/index"
+    os.makedirs(index_dir, exist_ok=True)
+    
+    lobsters = sorted(ranked, key=lambda lobster: lobster["token_id"])
+    columns = {
+        "token_id": array(INDEX_COLUMNS["token_id"], (lobster["token_id"] for lobster in lobsters)),
+        "score": array(INDEX_COLUMNS["score"], (lobster["rarity_score"] for lobster in lobsters)),
+        "rank": array(INDEX_COLUMNS["rank"], (lobster["rarity_rank"] for lobster in lobsters)),
+    }
+    for category, values in zip(sampler.categories, sampler.values):
+        lookup = {value: i for i, value in enumerate(values)}
+        columns[category] = array(TRAIT_TYPECODE, (lookup[lobster["traits"][category]] for lobster in lobsters))
+    
+    files = {}
+    for name, column in columns.items():
+        if sys.byteorder != "little":
+            column.byteswap()
+        files[name] = column_filename(name)
+        with open(f"{index_dir}/{files[name]}", 'wb') as f:
+            column.tofile(f)
+    
+    header = {
+        "rows": len(lobsters),
+        "rarity_method": rarity_method,
+        "image_extension": image_extension,
+        "layout": layout,
+        "metadata_format": metadata_format,
+        "sink": sink,
+        "categories": sampler.categories,
+        "values": sampler.values,
+        "columns": {name: {"file": files[name], "typecode": column.typecode}
+                    for name, column in columns.items()},
+    }
+    with open(f"{index_dir}/index.json", 'w') as f:
+        json.dump(header, f, indent=2)
+    return index_dir
+
+class TraitIndex:
+    """Memory-mapped view of a collection's trait index
+    
+    index = TraitIndex("lobster_collection_1000")
+    index.query({"Shell Color": "Golden", "Accessory": "Crown"})  # token ids
+    index.count({"Eyes": "Laser Eyes"})
+    """
+    
+    def __init__(self, output_dir):
+        index_dir = f"{output_dir}/index"
+        with open(f"{index_dir}/index.json") as f:
+            self.header = json.load(f)
+        self.rows = self.header["rows"]
+        self.categories = self.header["categories"]
+        self.values = dict(zip(self.categories, self.header["values"]))
+        self.image_extension = self.header["image_extension"]
+        self.layout = self.header.get("layout", "flat")
+        self.columns = {name: self._map(f"{index_dir}/{spec['file']}", spec["typecode"])
+                        for name, spec in self.header["columns"].items()}
+    
+    def _map(self, path, typecode):
+        if self.rows == 0:
+            return np.empty(0, dtype=typecode) if np is not None else array(typecode)
+        if np is not None:
+            return np.memmap(path, dtype=np.dtype(typecode).newbyteorder("<"), mode='r')
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped).cast(typecode)
+        if sys.byteorder != "little":
+            swapped = array(typecode, view)
+            swapped.byteswap()
+            return swapped
+        return view
+    
+    def __len__(self):
+        return self.rows
+    
+    def _value_indices(self, category, values):
+        if isinstance(values, str):
+            values = [values]
+        try:
+            return [self.values[category].index(value) for value in values]
+        except (KeyError, ValueError):
+            raise ValueError(f"Unknown trait {category}={values!r}")
+    
+    def mask(self, criteria):
+        """Row mask of tokens matching every category (a value or list of allowed values)"""
+        
+        if np is not None:
+            selected = np.ones(self.rows, dtype=bool)
+            for category, values in criteria.items():
+                selected &= np.isin(self.columns[category], self._value_indices(category, values))
+            return selected
+        
+        selected = [True] * self.rows
+        for category, values in criteria.items():
+            allowed = set(self._value_indices(category, values))
+            column = self.columns[category]
+            selected = [keep and column[row] in allowed for row, keep in enumerate(selected)]
+        return selected
+    
+    def query(self, criteria, order="token_id"):
+        """Token ids matching criteria, by token_id or rarest first (order="rank")"""
+        
+        selected = self.mask(criteria)
+        if np is not None:
+            rows = np.flatnonzero(selected)
+            if order == "rank":
+                rows = rows[np.argsort(self.columns["rank"][rows], kind="stable")]
+            return self.columns["token_id"][rows].tolist()
+        
+        rows = [row for row, keep in enumerate(selected) if keep]
+        if order == "rank":
+            rows.sort(key=lambda row: self.columns["rank"][row])
+        return [self.columns["token_id"][row] for row in rows]
+    
+    def count(self, criteria):
+        """Number of tokens matching criteria"""
+        selected = self.mask(criteria)
+        return int(selected.sum()) if np is not None else sum(selected)
+    
+    def value_counts(self, category):
+        """Tokens per value of one category"""
+        
+        column = self.columns[category]
+        values = self.values[category]
+        if np is not None:
+            counts = np.bincount(column, minlength=len(values)).tolist()
+        else:
+            counts = [0] * len(values)
+            for i in column:
+                counts[i] += 1
+        return dict(zip(values, counts))
+    
+    def token(self, token_id):
+        """Traits, score and rank of one token"""
+        
+        row = token_id - int(self.columns["token_id"][0]) if self.rows else -1
+        if not 0 <= row < self.rows or self.columns["token_id"][row] != token_id:
+            raise KeyError(token_id)
+        return {
+            "token_id": token_id,
+            "traits": {category: self.values[category][self.columns[category][row]]
+                       for category in self.categories},
+            "rarity_score": float(self.columns["score"][row]),
+            "rarity_rank": int(self.columns["rank"][row]),
+        }
+
+def parse_criterion(text):
+    category, _, value = text.partition("=")
+    return category.strip(), value.strip()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query a collection's trait index")
+    parser.add_argument("collection_dir", help="collection output directory (with index/)")
+    parser.add_argument("criteria", nargs="*", type=parse_criterion, metavar="CATEGORY=VALUE",
+                        help='e.g. "Shell Color=Golden" "Accessory=Crown" (repeat a category to allow several values)')
+    parser.add_argument("--count", action="store_true", help="only print the number of matches")
+    parser.add_argument("--order", default="token_id", choices=["token_id", "rank"],
+                        help="order of the matching token ids (default: token_id)")
+    parser.add_argument("--counts", metavar="CATEGORY", default=None,
+                        help="print how many tokens have each value of a category")
+    args = parser.parse_args()
+    
+    index = TraitIndex(args.collection_dir)
+    if args.counts:
+        for value, count in index.value_counts(args.counts).items():
+            print(f"{value}: {count}")
+    else:
+        criteria = {}
+        for category, value in args.criteria:
+            criteria.setdefault(category, []).append(value)
+        if args.count:
+            print(index.count(criteria))
+        else:
+            matches = index.query(criteria, args.order)
+            print(f"🔎 {len(matches)} of {len(index)} lobsters match")
+            print(" ".join(str(token_id) for token_id in matches))
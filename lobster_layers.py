@@ -0,0 +1,223 @@
+from PIL import Image, ImageDraw
+from functools import lru_cache
+import argparse
+import math
+import random
+import threading
+import time
+
+from simple_lobster import (
+    TRAITS, LAYER_VARIANTS, compile_layer, generate_traits, lobster_layers, replay_display_list,
+)
+
+# Half the side of the scratch canvas a layer is rasterized on. The lobster
+# reaches about 250px from its center (Gigantic claws, tall hats, long antennae).
+SPRITE_RADIUS = 300
+
+# Upper bound on cached sprites per scale. Layers only depend on a few traits
+# each (about 500 distinct layers), so every layer of a scale fits. Each scale
+# (image tier) has its own cache, so the tiers of a run don't evict each other.
+LAYER_CACHE_SIZE = 1024
+
+# Extra pixels around the scaled lobster bounds, covering stroke width rounding
+# and the sub-pixel part of the center
+BOUNDS_MARGIN = 3
+
+# LRU sprite caches of rasterize_layer, one per (frac_x, frac_y, scale)
+layer_caches = {}
+
+def render_layer(layer, args, frac_x=0.0, frac_y=0.0, scale=1.0):
+    """Cached rasterize_layer, with a separate LRU cache for every scale"""
+    
+    key = (frac_x, frac_y, scale)
+    cache = layer_caches.get(key)
+    if cache is None:
+        cache = layer_caches.setdefault(key, lru_cache(maxsize=LAYER_CACHE_SIZE)(rasterize_layer))
+    return cache(layer, args, frac_x, frac_y, scale)
+
+def rasterize_layer(layer, args, frac_x=0.0, frac_y=0.0, scale=1.0):
+    """Rasterize one trait layer into a cropped RGBA sprite
+    
+    Returns (sprite, (dx, dy)) where (dx, dy) is the offset of the sprite's
+    top-left corner from the lobster center, or (None, (0, 0)) for an empty
+    layer. frac_x/frac_y carry the sub-pixel part of the center so pasted
+    sprites match direct drawing pixel for pixel.
+    """
+    
+    radius = math.ceil(SPRITE_RADIUS * scale)
+    sprite = Image.new('RGBA', (2 * radius, 2 * radius), (0, 0, 0, 0))
+    replay_display_list(ImageDraw.Draw(sprite), compile_layer(layer, args),
+                        radius + frac_x, radius + frac_y, scale)
+    
+    bbox = sprite.getbbox()
+    if bbox is None:
+        return None, (0, 0)
+    return sprite.crop(bbox), (bbox[0] - radius, bbox[1] - radius)
+
+def draw_layered_lobster(img, center_x, center_y, traits, rng=None, scale=1.0, layers=None):
+    """Composite a lobster onto img from cached layer sprites
+    
+    Produces the same pixels as draw_simple_lobster with the same rng and
+    scale, but every layer is only rasterized once per distinct set of inputs.
+    Pass layers (from lobster_layers) to draw the same lobster several times.
+    """
+    
+    if layers is None:
+        layers = lobster_layers(traits, rng)
+    
+    origin_x = math.floor(center_x)
+    origin_y = math.floor(center_y)
+    frac_x = center_x - origin_x
+    frac_y = center_y - origin_y
+    
+    for layer, args in layers:
+        sprite, (dx, dy) = render_layer(layer, args, frac_x, frac_y, scale)
+        if sprite is not None:
+            img.paste(sprite, (origin_x + dx, origin_y + dy), sprite)
+
+def iter_layer_args():
+    """Yield every distinct (layer, args) pair the traits can produce"""
+    
+    shell_colors = [v["color"] for v in TRAITS["Shell Color"].values()]
+    claw_sizes = [v["size"] for v in TRAITS["Claw Size"].values()]
+    eye_styles = [v["style"] for v in TRAITS["Eyes"].values()]
+    tail_patterns = [v["pattern"] for v in TRAITS["Tail"].values()]
+    accessories = [v["type"] for v in TRAITS["Accessory"].values()]
+    
+    for shell_color in shell_colors:
+        for tail_pattern in tail_patterns:
+            variants = range(LAYER_VARIANTS) if tail_pattern == "spotted" else [0]
+            for variant in variants:
+                yield "tail", (shell_color, tail_pattern, variant)
+        yield "body", (shell_color,)
+        for eye_style in eye_styles:
+            variants = range(LAYER_VARIANTS) if eye_style == "googly" else [0]
+            for variant in variants:
+                yield "eyes", (shell_color, eye_style, variant)
+        for claw_size in claw_sizes:
+            yield "claws", (shell_color, claw_size)
+        for accessory in accessories:
+            yield "accessory", (shell_color, accessory)
+
+
+@lru_cache(maxsize=None)
+def lobster_bounds():
+    """Box (left, top, right, bottom) around the center that holds every layer at scale 1"""
+    
+    left = top = right = bottom = 0
+    for layer, args in iter_layer_args():
+        # Uncached, so measuring doesn't flush the sprite cache
+        sprite, (dx, dy) = rasterize_layer(layer, args)
+        if sprite is not None:
+            left = min(left, dx)
+            top = min(top, dy)
+            right = max(right, dx + sprite.width)
+            bottom = max(bottom, dy + sprite.height)
+    return left, top, right, bottom
+
+def lobster_box(center_x, center_y, scale=1.0):
+    """Pixel box any lobster drawn at this center and scale stays inside"""
+    
+    left, top, right, bottom = lobster_bounds()
+    return (
+        math.floor(center_x + left * scale) - BOUNDS_MARGIN,
+        math.floor(center_y + top * scale) - BOUNDS_MARGIN,
+        math.ceil(center_x + right * scale) + BOUNDS_MARGIN,
+        math.ceil(center_y + bottom * scale) + BOUNDS_MARGIN,
+    )
+
+class FramePool:
+    """Reusable flat-background frames to draw lobsters on
+    
+    Frames are kept per (background color, size). A frame handed out again
+    only has the lobster's bounding box refilled with the background instead
+    of allocating and filling a whole new image. Release every frame once it
+    has been encoded; the pool is thread safe so writer threads can do that.
+    At most max_free released frames are kept per key (one per thread that
+    can hold a frame is enough); extra ones are dropped, so a burst of
+    frames waiting for encoders doesn't stay allocated afterwards.
+    """
+    
+    def __init__(self, max_free=2):
+        self.max_free = max_free
+        self.free = {}
+        self.in_use = {}
+        self.lock = threading.Lock()
+    
+    def acquire(self, bg_color, size, box):
+        """Get a frame of this size and background; box is where the lobster will go"""
+        
+        key = (bg_color, size)
+        with self.lock:
+            frames = self.free.get(key)
+            frame, dirty = frames.pop() if frames else (None, None)
+        
+        if frame is None:
+            frame = Image.new('RGB', size, bg_color)
+        else:
+            left, top, right, bottom = dirty
+            frame.paste(bg_color, (max(left, 0), max(top, 0),
+                                   min(right, size[0]), min(bottom, size[1])))
+        
+        with self.lock:
+            self.in_use[id(frame)] = (key, box)
+        return frame
+    
+    def release(self, frame):
+        """Hand a frame back once nothing reads it any more"""
+        
+        with self.lock:
+            key, box = self.in_use.pop(id(frame))
+            frames = self.free.setdefault(key, [])
+            if len(frames) < self.max_free:
+                frames.append((frame, box))
+
+def render_benchmark(num_samples=200, seed=0, size=1400):
+    """Time fresh canvases against pooled frames for drawing lobsters"""
+    
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(num_samples):
+        traits = generate_traits(rng)
+        samples.append((traits, lobster_layers(traits, rng)))
+    scale = size / 1400
+    center = size / 2
+    box = lobster_box(center, center, scale)
+    frames = FramePool()
+    
+    def fresh(bg_color, layers):
+        img = Image.new('RGB', (size, size), bg_color)
+        draw_layered_lobster(img, center, center, None, scale=scale, layers=layers)
+    
+    def pooled(bg_color, layers):
+        img = frames.acquire(bg_color, (size, size), box)
+        draw_layered_lobster(img, center, center, None, scale=scale, layers=layers)
+        frames.release(img)
+    
+    # Warm the sprite cache and the bounds so only the per-token work is timed
+    lobster_bounds()
+    for traits, layers in samples:
+        fresh(TRAITS["Background"][traits["Background"]]["color"], layers)
+    
+    print(f"🧪 Render benchmark ({num_samples} lobsters, {size}x{size}px)")
+    print("=" * 40)
+    print(f"{'canvas':<20}{'ms/image':>10}")
+    report = {}
+    for name, render in (("fresh", fresh), ("pooled", pooled)):
+        start = time.perf_counter()
+        for traits, layers in samples:
+            render(TRAITS["Background"][traits["Background"]]["color"], layers)
+        report[name] = round((time.perf_counter() - start) / num_samples * 1000, 3)
+        print(f"{name:<20}{report[name]:>10.3f}")
+    print("=" * 40)
+    
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark drawing lobsters on pooled frames")
+    parser.add_argument("--samples", type=int, default=200, help="number of lobsters to draw")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the sample lobsters")
+    parser.add_argument("--size", type=int, default=1400, help="image size in pixels")
+    args = parser.parse_args()
+    
+    render_benchmark(num_samples=args.samples, seed=args.seed, size=args.size)
@@ -0,0 +1,288 @@
+from array import array
+from bisect import bisect_left
+from functools import partial
+import argparse
+import json
+import os
+import sys
+
+# Metadata sinks
+#   json          - one indented file per token in metadata/ (marketplace layout, default)
+#   json-compact  - one file per token without whitespace
+#   jsonl         - a single metadata.jsonl bundle, one token per line, plus a
+#                   metadata.jsonl.idx offset index for random access
+METADATA_FORMATS = {
+    "json": {"bundle": False, "compact": False},
+    "json-compact": {"bundle": False, "compact": True},
+    "jsonl": {"bundle": True, "compact": True},
+}
+
+# Records serialized per write() when filling a bundle
+METADATA_BATCH = 1000
+
+DESCRIPTION = ("A unique generative lobster from the Lobster NFT collection. Each lobster is "
+               "algorithmically generated with randomized traits and varying rarity.")
+EXTERNAL_URL = "https://your-project-url.com"
+
+# Offset index rows: token_id, byte offset and byte length of its bundle line (uint64, little-endian)
+INDEX_TYPECODE = "Q"
+
+def rarity_percentile(rank, total):
+    """Share of the collection (in %) that is less rare than the given rank"""
+    return round((1 - (rank / total)) * 100, 2)
+
+def token_metadata(lobster):
+    """Metadata of a lobster record that doesn't depend on the rest of the collection"""
+    
+    token_id = lobster["token_id"]
+    metadata = {
+        "name": f"Lobster #{token_id}",
+        "description": DESCRIPTION,
+        "image": lobster["image"],
+    }
+    
+    # Every rendered size, relative to the collection directory
+    if "tier_paths" in lobster:
+        metadata["image_tiers"] = {tier: f"{tier}/{lobster['image']}" for tier in lobster["tier_paths"]}
+    
+    metadata["external_url"] = EXTERNAL_URL
+    metadata["attributes"] = [
+        {"trait_type": category, "value": value}
+        for category, value in lobster["traits"].items()
+    ]
+    return metadata
+
+def build_metadata(lobster, rank, total):
+    """Build the final metadata (OpenSea/standard NFT format) for a ranked lobster"""
+    
+    metadata = token_metadata(lobster)
+    metadata.update({
+        "rarity_score": lobster["rarity_score"],
+        "rarity_rank": rank,
+        "rarity_percentile": rarity_percentile(rank, total)
+    })
+    return metadata
+
+class MetadataTemplate:
+    """Serializer pre-rendered for the fixed metadata schema
+    
+    Produces exactly what json.dumps(metadata, indent=2) would for
+    build_metadata output. Keys, the description, the URL and every
+    attribute object are encoded once and reused, so only the name, image
+    paths and numbers are formatted per token.
+    """
+    
+    def __init__(self):
+        nl, indent, colon = "\n", "  ", ": "
+        self.open = {1: nl + indent, 2: nl + indent * 2, 3: nl + indent * 3}
+        self.close = {1: nl, 2: nl + indent, 3: nl + indent * 2}
+        self.colon = colon
+        self.encoded = {}
+        self.attributes = {}
+        self.encoders = {
+            "name": json.dumps,
+            "description": self.string,
+            "image": json.dumps,
+            "image_tiers": self.image_tiers,
+            "external_url": self.string,
+            "attributes": self.attribute_list,
+            "rarity_score": json.dumps,
+            "rarity_rank": json.dumps,
+            "rarity_percentile": json.dumps,
+        }
+    
+    def string(self, text):
+        """JSON for a string that repeats across tokens (encoded once)"""
+        encoded = self.encoded.get(text)
+        if encoded is None:
+            encoded = self.encoded[text] = json.dumps(text)
+        return encoded
+    
+    def members(self, items, level):
+        if not items:
+            return "{}"
+        separator = "," + self.open[level]
+        return ("{" + self.open[level]
+                + separator.join(self.string(key) + self.colon + value for key, value in items)
+                + self.close[level] + "}")
+    
+    def image_tiers(self, tiers):
+        return self.members([(tier, json.dumps(path)) for tier, path in tiers.items()], 2)
+    
+    def attribute(self, category, value):
+        key = (category, value)
+        encoded = self.attributes.get(key)
+        if encoded is None:
+            encoded = self.attributes[key] = self.members(
+                [("trait_type", self.string(category)), ("value", self.string(value))], 3)
+        return encoded
+    
+    def attribute_list(self, attributes):
+        if not attributes:
+            return "[]"
+        if any(len(attribute) != 2 for attribute in attributes):
+            raise KeyError("attributes")
+        separator = "," + self.open[2]
+        return ("[" + self.open[2]
+                + separator.join(self.attribute(a["trait_type"], a["value"]) for a in attributes)
+                + self.close[2] + "]")
+    
+    def dumps(self, metadata):
+        items = []
+        try:
+            for key, value in metadata.items():
+                items.append((key, self.encoders[key](value)))
+        except KeyError:
+            # Not the fixed schema: let the json module lay it out
+            return json.dumps(metadata, indent=2)
+        return self.members(items, 1)
+
+def metadata_serializer(compact=False):
+    """Function that turns one token's metadata into JSON text
+    
+    Indented metadata goes through a MetadataTemplate, which skips the
+    json module's slow pure-Python indenting encoder. Without whitespace
+    json.dumps takes its C fast path, which beats the template.
+    """
+    
+    if compact:
+        return partial(json.dumps, separators=(",", ":"))
+    return MetadataTemplate().dumps
+
+def metadata_bundle_path(output_dir, name="metadata"):
+    return f"{output_dir}/{name}.jsonl"
+
+def write_metadata_bundle(path, ranked, dumps, sink=None):
+    """Write metadata lines in token_id order, METADATA_BATCH records per write
+    
+    Next to the bundle, path.idx holds a (token_id, offset, length) row per
+    line so single tokens can be read without scanning the file. Both go
+    through sink (see lobster_sinks) when given.
+    """
+    
+    ranks = {lobster["token_id"]: rank for rank, lobster in enumerate(ranked, 1)}
+    lobsters = sorted(ranked, key=lambda lobster: lobster["token_id"])
+    total = len(ranked)
+    index = array(INDEX_TYPECODE)
+    offset = 0
+    with (sink.open(path) if sink is not None else open(path, 'wb')) as f:
+        for start in range(0, total, METADATA_BATCH):
+            lines = []
+            for lobster in lobsters[start:start + METADATA_BATCH]:
+                token_id = lobster["token_id"]
+                line = dumps(build_metadata(lobster, ranks[token_id], total)).encode() + b"\n"
+                index.extend((token_id, offset, len(line) - 1))
+                offset += len(line)
+                lines.append(line)
+            f.write(b"".join(lines))
+    
+    if sys.byteorder != "little":
+        index.byteswap()
+    if sink is not None:
+        sink.write(f"{path}.idx", index.tobytes())
+    else:
+        with open(f"{path}.idx", 'wb') as f:
+            index.tofile(f)
+
+def write_metadata(ranked, metadata_format="json", output_dir=None, bundle_name="metadata", sink=None,
+                   token_ids=None):
+    """Write each token's metadata once; ranked is the collection sorted rarest first
+    
+    metadata_format picks the sink (see METADATA_FORMATS). Per-file formats
+    write each record's metadata_path; the jsonl bundle goes to
+    output_dir/<bundle_name>.jsonl. Files are written through sink (see
+    lobster_sinks) when given. token_ids limits per-file formats to those
+    tokens (a bundle is always rewritten whole). Returns where the metadata went.
+    """
+    
+    if metadata_format not in METADATA_FORMATS:
+        raise ValueError(f"Unknown metadata format {metadata_format!r} "
+                         f"(choose from {', '.join(METADATA_FORMATS)})")
+    spec = METADATA_FORMATS[metadata_format]
+    dumps = metadata_serializer(spec["compact"])
+    
+    if spec["bundle"]:
+        path = metadata_bundle_path(output_dir, bundle_name)
+        write_metadata_bundle(path, ranked, dumps, sink)
+        return sink.location(path) if sink is not None else path
+    
+    # Bytes straight to the file: no text layer, no incremental encoder
+    for rank, lobster in enumerate(ranked, 1):
+        if token_ids is not None and lobster["token_id"] not in token_ids:
+            continue
+        data = dumps(build_metadata(lobster, rank, len(ranked))).encode()
+        if sink is not None:
+            sink.write(lobster["metadata_path"], data)
+        else:
+            with open(lobster["metadata_path"], 'wb') as f:
+                f.write(data)
+    if output_dir is None:
+        return None
+    return sink.location(f"{output_dir}/metadata/") if sink is not None else f"{output_dir}/metadata/"
+
+class MetadataBundle:
+    """Random access to a metadata.jsonl bundle through its offset index
+    
+    bundle = MetadataBundle("lobster_collection_1000")
+    bundle.get(42)   # metadata of token 42
+    for token_id, metadata in bundle.items(): ...
+    """
+    
+    def __init__(self, output_dir, name="metadata"):
+        self.path = metadata_bundle_path(output_dir, name)
+        index = array(INDEX_TYPECODE)
+        with open(f"{self.path}.idx", 'rb') as f:
+            index.frombytes(f.read())
+        if sys.byteorder != "little":
+            index.byteswap()
+        self.token_ids = index[0::3]
+        self.offsets = index[1::3]
+        self.lengths = index[2::3]
+    
+    def __len__(self):
+        return len(self.token_ids)
+    
+    def get(self, token_id):
+        row = bisect_left(self.token_ids, token_id)
+        if row == len(self.token_ids) or self.token_ids[row] != token_id:
+            raise KeyError(token_id)
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[row])
+            return json.loads(f.read(self.lengths[row]))
+    
+    def items(self):
+        """(token_id, metadata) of every token, reading the bundle front to back"""
+        with open(self.path, 'rb') as f:
+            for token_id, line in zip(self.token_ids, f):
+                yield token_id, json.loads(line)
+
+def expand_bundle(output_dir, metadata_format="json", name="metadata"):
+    """Write per-file metadata/<token_id>.json from a bundle (for marketplaces that need files)"""
+    
+    if METADATA_FORMATS.get(metadata_format, {"bundle": True})["bundle"]:
+        raise ValueError(f"{metadata_format!r} is not a per-file metadata format")
+    dumps = metadata_serializer(METADATA_FORMATS[metadata_format]["compact"])
+    os.makedirs(f"{output_dir}/metadata", exist_ok=True)
+    bundle = MetadataBundle(output_dir, name)
+    for token_id, metadata in bundle.items():
+        with open(f"{output_dir}/metadata/{token_id}.json", 'wb') as f:
+            f.write(dumps(metadata).encode())
+    return len(bundle)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read or expand a collection's metadata bundle")
+    parser.add_argument("collection_dir", help="collection output directory (with metadata.jsonl)")
+    parser.add_argument("--token", type=int, default=None, help="print the metadata of one token")
+    parser.add_argument("--expand", default=None, choices=[f for f, spec in METADATA_FORMATS.items()
+                                                           if not spec["bundle"]],
+                        help="write metadata/<token_id>.json files from the bundle in this format")
+    args = parser.parse_args()
+    
+    if args.expand:
+        count = expand_bundle(args.collection_dir, args.expand)
+        print(f"✅ Wrote {count} metadata files to {args.collection_dir}/metadata/")
+    elif args.token is not None:
+        print(json.dumps(MetadataBundle(args.collection_dir).get(args.token), indent=2))
+    else:
+        print(f"📄 {len(MetadataBundle(args.collection_dir))} tokens in "
+              f"{metadata_bundle_path(args.collection_dir)}")
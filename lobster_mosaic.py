@@ -0,0 +1,210 @@
+from PIL import Image
+from collections import deque
+from multiprocessing import Pool
+import argparse
+import json
+import math
+import os
+import struct
+import zlib
+
+from simple_lobster import TRAITS
+from lobster_encoders import OUTPUT_FORMATS
+from lobster_index import TraitIndex
+from lobster_sinks import OUTPUT_SINKS, layout_path
+
+# Fill for the empty cells at the end of the last row
+MOSAIC_BG = (240, 240, 240)
+
+# Image extensions of vector formats, which Pillow can't open as tiles
+VECTOR_EXTENSIONS = {spec["extension"] for spec in OUTPUT_FORMATS.values() if spec["vector"]}
+
+class StripPNGWriter:
+    """Write an RGB PNG strip by strip, never holding the whole image
+    
+    Rows are deflated as they arrive and flushed as IDAT chunks, so a poster
+    of any size needs only one strip of memory.
+    """
+    
+    def __init__(self, fp, width, height, compress_level=6):
+        self.fp = fp
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self.compressor = zlib.compressobj(compress_level)
+        fp.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    
+    def _chunk(self, kind, data):
+        self.fp.write(struct.pack(">I", len(data)))
+        self.fp.write(kind)
+        self.fp.write(data)
+        self.fp.write(struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff))
+    
+    def write_strip(self, strip):
+        """Append an RGB image as the next rows of the PNG"""
+        
+        if strip.width != self.width or strip.mode != 'RGB':
+            raise ValueError("Strips must be RGB and as wide as the PNG")
+        stride = self.width * 3
+        raw = strip.tobytes()
+        rows = bytearray()
+        for y in range(strip.height):
+            rows += b"\x00"  # filter type: None
+            rows += raw[y * stride:(y + 1) * stride]
+        self.rows_written += strip.height
+        
+        data = self.compressor.compress(bytes(rows))
+        if data:
+            self._chunk(b"IDAT", data)
+    
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError(f"Wrote {self.rows_written} of {self.height} rows")
+        self._chunk(b"IDAT", self.compressor.flush())
+        self._chunk(b"IEND", b"")
+
+def load_tokens(collection_dir):
+    """Read token_id, rank, traits and image name of every token
+    
+    Uses the collection's trait index when there is one and falls back to
+    reading every metadata file. Collections written to a zip or tar sink
+    are rejected, since their images aren't in tier directories.
+    """
+    
+    if os.path.exists(f"{collection_dir}/index/index.json"):
+        index = TraitIndex(collection_dir)
+        sink = index.header.get("sink", "files")
+        if OUTPUT_SINKS[sink]["archive"]:
+            raise ValueError(f"{collection_dir} was written to a {sink} archive; extract it into the "
+                             f"collection directory before building a mosaic")
+        tokens = []
+        for token_id in index.columns["token_id"]:
+            token = index.token(int(token_id))
+            tokens.append({
+                "token_id": token["token_id"],
+                "rank": token["rarity_rank"],
+                "traits": token["traits"],
+                "image": layout_path(token["token_id"], f"{token['token_id']}.{index.image_extension}",
+                                     index.layout),
+            })
+        return tokens
+    
+    tokens = []
+    metadata_dir = f"{collection_dir}/metadata"
+    for directory, _, filenames in os.walk(metadata_dir):
+        for filename in filenames:
+            if not filename.endswith(".json"):
+                continue
+            with open(f"{directory}/{filename}") as f:
+                metadata = json.load(f)
+            tokens.append({
+                "token_id": int(filename[:-len(".json")]),
+                "rank": metadata.get("rarity_rank"),
+                "traits": {a["trait_type"]: a["value"] for a in metadata["attributes"]},
+                "image": metadata["image"],
+            })
+    return tokens
+
+def order_tokens(tokens, order="token_id"):
+    """Sort tokens by "token_id", "rank" or a trait category (e.g. "Shell Color")"""
+    
+    if order == "token_id":
+        return sorted(tokens, key=lambda t: t["token_id"])
+    if order == "rank":
+        return sorted(tokens, key=lambda t: (t["rank"] is None, t["rank"] or 0, t["token_id"]))
+    if order in TRAITS:
+        # Group by trait value in TRAITS order, rarest lobsters first within a group
+        positions = {value: i for i, value in enumerate(TRAITS[order])}
+        return sorted(tokens, key=lambda t: (positions.get(t["traits"].get(order), len(positions)),
+                                             t["rank"] or 0, t["token_id"]))
+    raise ValueError(f"Unknown order {order!r} (use token_id, rank or a trait category)")
+
+def load_tile(job):
+    """Open one token image and downsample it to a cell (runs in a worker process)"""
+    
+    path, cell_size = job
+    with Image.open(path) as img:
+        tile = img.convert('RGB').resize((cell_size, cell_size), Image.LANCZOS, reducing_gap=2.0)
+    return tile.tobytes()
+
+def load_tiles(jobs):
+    """load_tile for a batch of jobs, so workers get a few tiles per task"""
+    return [load_tile(job) for job in jobs]
+
+def build_mosaic(collection_dir, output_path, columns=None, cell_size=128, order="token_id",
+                 source_tier="images", workers=None, compress_level=6):
+    """Assemble a contact sheet of an existing collection
+    
+    Images are read from collection_dir/source_tier (pick a thumbnail tier to
+    skip most of the decoding), downsampled to cell_size in a process pool and
+    written one grid row at a time. Only about two rows of tiles (at least a
+    batch per worker) are queued or waiting ahead of the writer, so peak
+    memory stays at a few strips.
+    """
+    
+    tokens = order_tokens(load_tokens(collection_dir), order)
+    if not tokens:
+        raise ValueError(f"No metadata found in {collection_dir}/metadata")
+    if columns is None:
+        columns = math.ceil(math.sqrt(len(tokens)))
+    # Checked before the output file is created, so a failure leaves nothing behind
+    if not os.path.isdir(f"{collection_dir}/{source_tier}"):
+        raise ValueError(f"No {source_tier}/ directory in {collection_dir} (archived shards need "
+                         f"extracting first)")
+    extension = os.path.splitext(tokens[0]["image"])[1].lstrip(".")
+    if extension in VECTOR_EXTENSIONS:
+        raise ValueError(f"{collection_dir} holds .{extension} images, which the mosaic can't read; "
+                         f"build it from a raster collection (--format png, png-palette or webp)")
+    rows = math.ceil(len(tokens) / columns)
+    width = columns * cell_size
+    height = rows * cell_size
+    
+    print(f"🧩 Building {columns}x{rows} mosaic of {len(tokens)} lobsters ({width}x{height}px)...")
+    
+    jobs = [(f"{collection_dir}/{source_tier}/{token['image']}", cell_size) for token in tokens]
+    chunksize = max(1, columns // 4)
+    batches = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+    in_flight = max(2 * math.ceil(columns / chunksize), workers or os.cpu_count() or 1)
+    
+    def bounded_tiles(pool):
+        # Like pool.imap, but never more than in_flight batches ahead of the writer
+        pending = deque()
+        for batch in batches:
+            if len(pending) >= in_flight:
+                yield from pending.popleft().get()
+            pending.append(pool.apply_async(load_tiles, (batch,)))
+        while pending:
+            yield from pending.popleft().get()
+    
+    with open(output_path, 'wb') as fp, Pool(workers) as pool:
+        writer = StripPNGWriter(fp, width, height, compress_level)
+        tiles = bounded_tiles(pool)
+        for row in range(rows):
+            strip = Image.new('RGB', (width, cell_size), MOSAIC_BG)
+            for col in range(min(columns, len(tokens) - row * columns)):
+                tile = Image.frombytes('RGB', (cell_size, cell_size), next(tiles))
+                strip.paste(tile, (col * cell_size, 0))
+            writer.write_strip(strip)
+            if (row + 1) % 10 == 0 or row + 1 == rows:
+                print(f"✓ Wrote row {row + 1}/{rows}")
+        writer.close()
+    
+    print(f"✅ Mosaic saved to: {output_path}")
+    return output_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a contact sheet from a generated collection")
+    parser.add_argument("collection_dir", help="collection output directory (with metadata/ and images/)")
+    parser.add_argument("output", help="PNG file to write")
+    parser.add_argument("--columns", type=int, default=None, help="grid columns (default: square grid)")
+    parser.add_argument("--cell-size", type=int, default=128, help="pixels per lobster (default: 128)")
+    parser.add_argument("--order", default="token_id",
+                        help='token_id, rank, or a trait category such as "Shell Color" (default: token_id)')
+    parser.add_argument("--source-tier", default="images",
+                        help="image directory to read, e.g. thumbnails (default: images)")
+    parser.add_argument("--workers", type=int, default=None, help="downsampling processes (default: all cores)")
+    args = parser.parse_args()
+    
+    build_mosaic(args.collection_dir, args.output, columns=args.columns, cell_size=args.cell_size,
+                 order=args.order, source_tier=args.source_tier, workers=args.workers)
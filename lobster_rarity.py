@@ -0,0 +1,170 @@
+from bisect import bisect_left, bisect_right
+from collections import Counter
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure-Python path gives the same ranks
+    np = None
+
+from lobster_sampler import TraitSampler
+
+# Rarity scoring methods (higher score = rarer for all of them)
+#   weights      - sum of (100 - configured rarity), the original score
+#   trait        - sum of 1 / trait frequency in the collection (rarity.tools style)
+#   information  - information content of the traits normalized by the
+#                  collection entropy (OpenRarity style)
+#   statistical  - 1 / product of trait frequencies ("one in X" odds)
+RARITY_METHODS = {
+    "weights": {"decimals": 2},
+    "trait": {"decimals": 2},
+    "information": {"decimals": 4},
+    "statistical": {"decimals": 2},
+}
+
+def trait_matrix(traits_list, sampler=None):
+    """Encode trait dicts as an (N, categories) matrix of value indices
+    
+    Returns a NumPy uint8 array, or a list of index lists without NumPy.
+    """
+    
+    if sampler is None:
+        sampler = TraitSampler()
+    lookups = [{value: i for i, value in enumerate(values)} for values in sampler.values]
+    rows = [[lookup[traits[category]] for category, lookup in zip(sampler.categories, lookups)]
+            for traits in traits_list]
+    if np is None:
+        return rows
+    return np.array(rows, dtype=np.uint8).reshape(len(rows), len(sampler.categories))
+
+def score_matrix(matrix, method="weights", sampler=None):
+    """Rarity score of every row of a trait index matrix (see RARITY_METHODS)"""
+    
+    if method not in RARITY_METHODS:
+        raise ValueError(f"Unknown rarity method {method!r} (choose from {', '.join(RARITY_METHODS)})")
+    if sampler is None:
+        sampler = TraitSampler()
+    if np is None:
+        return _score_rows(matrix, method, sampler)
+    
+    matrix = np.asarray(matrix)
+    n = len(matrix)
+    scores = np.zeros(n, dtype=np.float64)
+    if n == 0:
+        return scores
+    
+    entropy = 0.0
+    for column, (values, weights) in enumerate(zip(sampler.values, sampler.weights)):
+        indices = matrix[:, column]
+        if method == "weights":
+            scores += (100 - np.asarray(weights, dtype=np.float64))[indices]
+            continue
+        
+        frequency = np.bincount(indices, minlength=len(values)) / n
+        token_frequency = frequency[indices]
+        if method == "trait":
+            scores += 1 / token_frequency
+        else:
+            scores -= np.log2(token_frequency)
+            present = frequency[frequency > 0]
+            entropy -= float((present * np.log2(present)).sum())
+    
+    if method == "information":
+        scores = scores / entropy if entropy > 0 else np.zeros(n)
+    elif method == "statistical":
+        scores = np.exp2(scores)
+    
+    return np.round(scores, RARITY_METHODS[method]["decimals"])
+
+def _score_rows(rows, method, sampler):
+    """Pure-Python version of score_matrix"""
+    
+    n = len(rows)
+    columns = list(zip(*rows)) if rows else []
+    scores = [0.0] * n
+    entropy = 0.0
+    for column, weights in zip(columns, sampler.weights):
+        if method == "weights":
+            for row, i in enumerate(column):
+                scores[row] += 100 - weights[i]
+            continue
+        
+        counts = Counter(column)
+        for row, i in enumerate(column):
+            if method == "trait":
+                scores[row] += n / counts[i]
+            else:
+                scores[row] -= math.log2(counts[i] / n)
+        entropy -= sum(count / n * math.log2(count / n) for count in counts.values())
+    
+    if method == "information":
+        scores = [score / entropy if entropy > 0 else 0.0 for score in scores]
+    elif method == "statistical":
+        scores = [2 ** score for score in scores]
+    
+    decimals = RARITY_METHODS[method]["decimals"]
+    return [round(score, decimals) for score in scores]
+
+def rank_scores(scores, token_ids):
+    """1-based rarity ranks (rarest first), ties broken by the lower token_id"""
+    
+    if np is None:
+        order = sorted(range(len(scores)), key=lambda i: (-scores[i], token_ids[i]))
+        ranks = [0] * len(scores)
+        for rank, i in enumerate(order, 1):
+            ranks[i] = rank
+        return ranks
+    
+    order = np.lexsort((np.asarray(token_ids), -np.asarray(scores)))
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(1, len(order) + 1)
+    return ranks
+
+def rank_collection(collection, method="weights", sampler=None):
+    """Score and rank a list of lobster records in place, returning them rarest first
+    
+    Every record needs "token_id" and "traits"; "rarity_score" is (re)set
+    and "rarity_rank" added.
+    """
+    
+    if sampler is None:
+        sampler = TraitSampler()
+    matrix = trait_matrix([lobster["traits"] for lobster in collection], sampler)
+    scores = score_matrix(matrix, method, sampler)
+    ranks = rank_scores(scores, [lobster["token_id"] for lobster in collection])
+    
+    for lobster, score, rank in zip(collection, scores, ranks):
+        # Whole scores stay ints so metadata reads "485" like it always has
+        score = float(score)
+        lobster["rarity_score"] = int(score) if score.is_integer() else score
+        lobster["rarity_rank"] = int(rank)
+    return sorted(collection, key=lambda lobster: lobster["rarity_rank"])
+
+def insert_ranks(old_scores, old_ranks, new_scores, new_token_ids):
+    """Ranks after adding tokens to a ranked collection, without re-sorting it
+    
+    The new tokens must have higher token ids than every existing one (so
+    they lose ties) and the scores must not depend on the rest of the
+    collection (the "weights" method). Each existing token moves down by the
+    number of new tokens that outscore it, and each new token lands behind
+    every existing token with the same or a higher score. Returns (ranks of
+    the existing tokens, ranks of the new tokens).
+    """
+    
+    new_ranks = rank_scores(new_scores, new_token_ids)
+    if np is not None:
+        new_sorted = np.sort(np.asarray(new_scores, dtype=np.float64))
+        old_sorted = np.sort(np.asarray(old_scores, dtype=np.float64))
+        old_ranks = (np.asarray(old_ranks) + len(new_sorted)
+                     - np.searchsorted(new_sorted, old_scores, side="right"))
+        new_ranks = (np.asarray(new_ranks) + len(old_sorted)
+                     - np.searchsorted(old_sorted, new_scores, side="left"))
+        return old_ranks, new_ranks
+    
+    new_sorted = sorted(new_scores)
+    old_sorted = sorted(old_scores)
+    old_ranks = [rank + len(new_sorted) - bisect_right(new_sorted, score)
+                 for rank, score in zip(old_ranks, old_scores)]
+    new_ranks = [rank + len(old_sorted) - bisect_left(old_sorted, score)
+                 for rank, score in zip(new_ranks, new_scores)]
+    return old_ranks, new_ranks
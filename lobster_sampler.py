@@ -0,0 +1,192 @@
+from bisect import bisect
+from itertools import accumulate, product
+import heapq
+import random
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the vectorized sampler needs it
+    np = None
+
+from simple_lobster import TRAITS
+
+def build_alias_table(weights):
+    """Build a Walker/Vose alias table (prob, alias) for the given weights"""
+    
+    n = len(weights)
+    total = float(sum(weights))
+    scaled = [weight * n / total for weight in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1.0 - scaled[less]
+        if scaled[more] < 1.0:
+            small.append(more)
+        else:
+            large.append(more)
+    
+    # Whatever is left is 1.0 up to rounding error
+    for i in small + large:
+        prob[i] = 1.0
+    
+    return prob, alias
+
+class CombinationSet:
+    """Bitset of used trait-combination codes (one bit per possible combination)"""
+    
+    def __init__(self, size, codes=()):
+        self.size = size
+        self.bits = bytearray((size + 7) // 8)
+        self.count = 0
+        for code in codes:
+            self.add(code)
+    
+    def add(self, code):
+        byte, bit = divmod(code, 8)
+        if not self.bits[byte] & (1 << bit):
+            self.bits[byte] |= 1 << bit
+            self.count += 1
+    
+    def __contains__(self, code):
+        byte, bit = divmod(code, 8)
+        return bool(self.bits[byte] & (1 << bit))
+    
+    def __len__(self):
+        return self.count
+
+class TraitSampler:
+    """TRAITS compiled once into lookup tables for fast weighted sampling
+    
+    sample() draws one trait dict exactly like generate_traits (same random
+    stream, so seeded collections are unchanged). sample_batch() and
+    sample_matrix() use alias tables for bulk draws with the same
+    distribution, e.g. for rarity simulations.
+    """
+    
+    def __init__(self, traits=None):
+        if traits is None:
+            traits = TRAITS
+        self.categories = list(traits)
+        self.values = [list(options) for options in traits.values()]
+        self.weights = [[options[value]["rarity"] for value in options]
+                        for options in traits.values()]
+        self.cum_weights = [list(accumulate(weights)) for weights in self.weights]
+        self.alias_tables = [build_alias_table(weights) for weights in self.weights]
+        
+        # Mixed-radix encoding: every combination is one integer in [0, combinations)
+        self.radices = [len(values) for values in self.values]
+        self.combinations = 1
+        for radix in self.radices:
+            self.combinations *= radix
+    
+    def sample(self, rng=None):
+        """Draw one trait dict (same results as generate_traits for the same rng)"""
+        
+        if rng is None:
+            rng = random
+        traits = {}
+        for category, values, cum_weights in zip(self.categories, self.values, self.cum_weights):
+            # Mirrors random.choices, minus rebuilding the tables every call
+            traits[category] = values[bisect(cum_weights, rng.random() * cum_weights[-1], 0, len(values) - 1)]
+        return traits
+    
+    def sample_indices(self, rng=None):
+        """Draw one token as a list of value indices (one per category) from the alias tables"""
+        
+        if rng is None:
+            rng = random
+        indices = []
+        for prob, alias in self.alias_tables:
+            u = rng.random() * len(prob)
+            i = int(u)
+            indices.append(i if u - i < prob[i] else alias[i])
+        return indices
+    
+    def decode(self, indices):
+        """Turn a row of value indices back into a trait dict"""
+        return {category: values[i]
+                for category, values, i in zip(self.categories, self.values, indices)}
+    
+    def encode(self, indices):
+        """Mixed-radix code of a row of value indices (first category most significant)"""
+        code = 0
+        for radix, i in zip(self.radices, indices):
+            code = code * radix + i
+        return code
+    
+    def decode_code(self, code):
+        """Row of value indices for a mixed-radix combination code"""
+        indices = []
+        for radix in reversed(self.radices):
+            code, i = divmod(code, radix)
+            indices.append(i)
+        return indices[::-1]
+    
+    def encode_traits(self, traits):
+        """Mixed-radix code of a trait dict"""
+        return self.encode([values.index(traits[category])
+                            for category, values in zip(self.categories, self.values)])
+    
+    def sample_unique(self, n, rng=None, used=None):
+        """Draw n trait dicts with no repeated combination
+        
+        Weighted sampling without replacement (Efraimidis-Spirakis): every
+        combination gets an exponential key with rate equal to its weight (the
+        product of its trait rarities) and the n smallest keys win. That is the
+        same as drawing one token at a time and removing each drawn combination,
+        but it never retries, so it works all the way up to the full
+        combination space. Codes in used (a CombinationSet, e.g. an existing
+        collection) are skipped. The winners are shuffled so token order does
+        not give away rarity.
+        """
+        
+        if rng is None:
+            rng = random
+        available = self.combinations - (len(used) if used is not None else 0)
+        if n > available:
+            raise ValueError(f"Cannot draw {n} unique lobsters, only {available} "
+                             f"of {self.combinations} trait combinations are available")
+        
+        def keyed_codes():
+            for code, weights in enumerate(product(*self.weights)):
+                if used is not None and code in used:
+                    continue
+                weight = 1.0
+                for rarity in weights:
+                    weight *= rarity
+                if weight > 0:
+                    yield rng.expovariate(weight), code
+        
+        winners = [code for _, code in heapq.nsmallest(n, keyed_codes())]
+        if len(winners) < n:
+            raise ValueError(f"Cannot draw {n} unique lobsters, only {len(winners)} "
+                             f"trait combinations have a non-zero rarity")
+        rng.shuffle(winners)
+        return [self.decode(self.decode_code(code)) for code in winners]
+    
+    def sample_batch(self, n, rng=None):
+        """Draw n trait dicts at once"""
+        return [self.decode(self.sample_indices(rng)) for _ in range(n)]
+    
+    def sample_matrix(self, n, seed=None):
+        """Draw n tokens as an (n, categories) uint8 matrix of value indices (needs NumPy)"""
+        
+        if np is None:
+            raise ImportError("sample_matrix needs NumPy (pip install numpy)")
+        
+        generator = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        matrix = np.empty((n, len(self.categories)), dtype=np.uint8)
+        for column, (prob, alias) in enumerate(self.alias_tables):
+            prob = np.asarray(prob)
+            alias = np.asarray(alias)
+            u = generator.random(n) * len(prob)
+            i = u.astype(np.intp)
+            matrix[:, column] = np.where(u - i < prob[i], i, alias[i])
+        return matrix
@@ -0,0 +1,252 @@
+import argparse
+import copy
+import json
+import time
+
+try:
+    import numpy as np
+except ImportError:  # the simulator is vectorized throughout and needs NumPy
+    np = None
+
+from simple_lobster import TRAITS
+from lobster_sampler import TraitSampler, build_alias_table
+
+# Trait values configured at or below this rarity are reported as legendary
+LEGENDARY_RARITY = 1
+
+# Neighbouring categories are drawn together from one alias table of at most
+# this many combinations, so a token costs two draws instead of six
+GROUP_COMBINATIONS = 4096
+
+# Tokens simulated at once; trials run in chunks this size so the arrays stay in cache
+CHUNK_TOKENS = 250_000
+
+SCORE_PERCENTILES = (0.1, 1, 5, 25, 50, 75, 95, 99, 99.9)
+
+def category_groups(radices):
+    """Split category indices into runs whose combined combinations fit GROUP_COMBINATIONS"""
+    
+    groups = [[]]
+    size = 1
+    for category, radix in enumerate(radices):
+        if groups[-1] and size * radix > GROUP_COMBINATIONS:
+            groups.append([])
+            size = 1
+        groups[-1].append(category)
+        size *= radix
+    return groups
+
+def group_tables(sampler):
+    """(prob, alias, size) alias tables over the joint values of each category group"""
+    
+    tables = []
+    for group in category_groups(sampler.radices):
+        weights = np.ones(1)
+        for category in group:
+            weights = np.multiply.outer(weights, np.asarray(sampler.weights[category], dtype=np.float64)).ravel()
+        prob, alias = build_alias_table(weights.tolist())
+        tables.append((np.asarray(prob), np.asarray(alias, dtype=np.int32), len(weights)))
+    return tables
+
+def score_levels(sampler):
+    """Distinct rarity scores and the level of every combination code ("weights" scoring)"""
+    
+    scores = np.zeros(1)
+    for weights in sampler.weights:
+        scores = np.add.outer(scores, 100 - np.asarray(weights, dtype=np.float64)).ravel()
+    levels, code_levels = np.unique(np.round(scores, 2), return_inverse=True)
+    return levels, code_levels.astype(np.min_scalar_type(len(levels)))
+
+def interval(samples, confidence):
+    """Central confidence interval of samples along the first axis"""
+    
+    tail = (1 - confidence) / 2 * 100
+    return np.percentile(samples, [tail, 100 - tail], axis=0, method="nearest")
+
+def simulate_rarity(num_lobsters=1000, trials=1000, seed=None, confidence=0.95, traits=None):
+    """Monte Carlo of trait counts, duplicates and rarity scores, without rendering
+    
+    Draws trials independent collections of num_lobsters tokens from the
+    traits table (TRAITS by default) with the same distribution as a
+    generated collection without --unique, and returns a report dict:
+    per-value expected counts with confidence intervals, the chance that two
+    tokens share a trait combination, the legendary values
+    (LEGENDARY_RARITY) and the distribution of "weights" rarity scores.
+    Each category group is one vectorized alias draw per token, so 10k
+    tokens x 1000 trials takes well under a second.
+    """
+    
+    if np is None:
+        raise ImportError("The rarity simulator needs NumPy (pip install numpy)")
+    if num_lobsters <= 0 or trials <= 0:
+        raise ValueError("Need at least one lobster and one trial")
+    
+    start = time.perf_counter()
+    sampler = TraitSampler(traits)
+    tables = group_tables(sampler)
+    levels, code_levels = score_levels(sampler)
+    code_type = np.int32 if sampler.combinations < 2**31 else np.int64
+    generator = np.random.default_rng(seed)
+    
+    group_counts = [np.zeros((trials, size), dtype=np.int64) for _, _, size in tables]
+    duplicates = np.zeros(trials, dtype=np.int64)
+    lowest = np.zeros(trials, dtype=np.intp)
+    highest = np.zeros(trials, dtype=np.intp)
+    histogram = np.zeros(len(levels), dtype=np.int64)
+    
+    chunk = max(1, CHUNK_TOKENS // num_lobsters)
+    for first in range(0, trials, chunk):
+        rows = slice(first, min(first + chunk, trials))
+        count = rows.stop - rows.start
+        codes = np.zeros((count, num_lobsters), dtype=code_type)
+        offsets = np.arange(count, dtype=np.int32)[:, None]
+        u = np.empty((count, num_lobsters))
+        for (prob, alias, size), counts in zip(tables, group_counts):
+            # Alias method: a uniform bucket, then the bucket's value or its alias
+            generator.random(out=u)
+            u *= size
+            i = u.astype(np.int32)
+            u -= i
+            drawn = np.where(u < prob[i], i, alias[i])
+            counts[rows] = np.bincount((drawn + offsets * size).ravel(),
+                                       minlength=count * size).reshape(count, size)
+            codes *= size
+            codes += drawn
+        
+        # Sorted codes put equal combinations next to each other
+        codes.sort(axis=1)
+        duplicates[rows] = (codes[:, 1:] == codes[:, :-1]).sum(axis=1)
+        token_levels = code_levels[codes]
+        lowest[rows] = token_levels.min(axis=1)
+        highest[rows] = token_levels.max(axis=1)
+        histogram += np.bincount(token_levels.ravel(), minlength=len(levels))
+    
+    # Per-category counts from the joint counts of each group
+    category_counts = []
+    for group, counts in zip(category_groups(sampler.radices), group_counts):
+        shape = [trials] + [sampler.radices[category] for category in group]
+        joint = counts.reshape(shape)
+        for axis in range(len(group)):
+            others = tuple(1 + other for other in range(len(group)) if other != axis)
+            category_counts.append(joint.sum(axis=others))
+    
+    report = {
+        "num_lobsters": num_lobsters,
+        "trials": trials,
+        "seed": seed,
+        "confidence": confidence,
+        "traits": {},
+        "legendary": {},
+    }
+    for category, values, weights, counts in zip(sampler.categories, sampler.values, sampler.weights,
+                                                 category_counts):
+        low, high = interval(counts, confidence)
+        total = sum(weights)
+        report["traits"][category] = {}
+        for i, (value, weight) in enumerate(zip(values, weights)):
+            stats = {
+                "rarity": weight,
+                "expected": round(num_lobsters * weight / total, 2),
+                "low": float(low[i]),
+                "high": float(high[i]),
+            }
+            report["traits"][category][value] = stats
+            if weight <= LEGENDARY_RARITY:
+                report["legendary"][value] = dict(stats, category=category,
+                                                  p_none=float((counts[:, i] == 0).mean()))
+    
+    low, high = interval(duplicates, confidence)
+    report["duplicates"] = {
+        "probability": float((duplicates > 0).mean()),
+        "expected": float(duplicates.mean()),
+        "low": float(low),
+        "high": float(high),
+    }
+    
+    cumulative = np.cumsum(histogram) / histogram.sum()
+    lowest_low, lowest_high = interval(levels[lowest], confidence)
+    highest_low, highest_high = interval(levels[highest], confidence)
+    report["rarity_score"] = {
+        "mean": round(float((levels * histogram).sum() / histogram.sum()), 2),
+        "percentiles": {str(p): float(levels[min(np.searchsorted(cumulative, p / 100), len(levels) - 1)])
+                        for p in SCORE_PERCENTILES},
+        "lowest": {"expected": round(float(levels[lowest].mean()), 2),
+                   "low": float(lowest_low), "high": float(lowest_high)},
+        "highest": {"expected": round(float(levels[highest].mean()), 2),
+                    "low": float(highest_low), "high": float(highest_high)},
+        "histogram": [[float(score), int(tokens)] for score, tokens in zip(levels, histogram) if tokens],
+    }
+    report["seconds"] = round(time.perf_counter() - start, 3)
+    return report
+
+def print_simulation(report, histogram_bins=12):
+    """Print a simulate_rarity report"""
+    
+    confidence = f"{report['confidence']:.0%}"
+    print(f"🎲 {report['trials']} simulated collections of {report['num_lobsters']} lobsters "
+          f"({report['seconds']:.2f}s)")
+    print("=" * 60)
+    
+    print(f"\n📊 Expected trait counts ({confidence} interval):")
+    for category, values in report["traits"].items():
+        print(f"\n  {category}:")
+        for value, stats in values.items():
+            print(f"    • {value}: {stats['expected']:g} ({stats['low']:g}-{stats['high']:g})")
+    
+    print(f"\n👑 Legendary traits (rarity ≤ {LEGENDARY_RARITY}):")
+    for value, stats in report["legendary"].items():
+        print(f"    • {value} ({stats['category']}): {stats['expected']:g} "
+              f"({stats['low']:g}-{stats['high']:g}), none at all in {stats['p_none']:.1%} of collections")
+    
+    duplicates = report["duplicates"]
+    print(f"\n👯 Duplicate trait combinations: {duplicates['probability']:.1%} of collections have one; "
+          f"{duplicates['expected']:g} repeated lobsters on average ({duplicates['low']:g}-{duplicates['high']:g})")
+    
+    scores = report["rarity_score"]
+    print(f"\n🏆 Rarity scores (weights): mean {scores['mean']:g}, rarest lobster "
+          f"{scores['highest']['expected']:g} ({scores['highest']['low']:g}-{scores['highest']['high']:g}), "
+          f"least rare {scores['lowest']['expected']:g}")
+    print("    " + "  ".join(f"p{p}: {score:g}" for p, score in scores["percentiles"].items()))
+    
+    # Coarse text histogram of the per-token scores
+    edges = np.linspace(scores["histogram"][0][0], scores["histogram"][-1][0], histogram_bins + 1)
+    bins = np.zeros(histogram_bins, dtype=np.int64)
+    for score, tokens in scores["histogram"]:
+        bins[min(np.searchsorted(edges, score, side="right") - 1, histogram_bins - 1)] += tokens
+    for left, right, tokens in zip(edges, edges[1:], bins):
+        share = tokens / bins.sum()
+        print(f"    {left:7.1f}-{right:7.1f} {'█' * round(share * 50):<50} {share:6.2%}")
+
+def parse_rarity(text):
+    """CATEGORY=VALUE=RARITY override for --rarity"""
+    
+    category, value, rarity = text.rsplit("=", 2)
+    return category.strip(), value.strip(), float(rarity)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate trait and rarity distributions without rendering")
+    parser.add_argument("--count", type=int, default=1000,
+                        help="lobsters per simulated collection (default: 1000)")
+    parser.add_argument("--trials", type=int, default=1000,
+                        help="number of simulated collections (default: 1000)")
+    parser.add_argument("--seed", type=int, default=None, help="simulation seed (default: random)")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="confidence level of the reported intervals (default: 0.95)")
+    parser.add_argument("--rarity", type=parse_rarity, action="append", default=[],
+                        metavar="CATEGORY=VALUE=RARITY",
+                        help='try a different rarity without editing TRAITS, e.g. "Accessory=Crown=3" (repeatable)')
+    parser.add_argument("--json", default=None, metavar="PATH", help="also write the full report as JSON")
+    args = parser.parse_args()
+    
+    traits = copy.deepcopy(TRAITS)
+    for category, value, rarity in args.rarity:
+        if value not in traits.get(category, {}):
+            parser.error(f"Unknown trait {category}={value}")
+        traits[category][value]["rarity"] = rarity
+    
+    report = simulate_rarity(args.count, args.trials, args.seed, args.confidence, traits)
+    print_simulation(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Report saved to: {args.json}")
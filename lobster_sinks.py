@@ -0,0 +1,143 @@
+from contextlib import contextmanager
+import hashlib
+import io
+import os
+import tarfile
+import zipfile
+
+# Where a run's images and metadata go
+#   files   - flat tier directories, images/1234.png (the classic layout)
+#   hashed  - tier directories fanned out into 256 buckets by a hash of the
+#             token id, images/3a/1234.png (about 400 files a bucket at 100k tokens)
+#   zip     - one uncompressed ZIP streamed as tokens finish (PNG/WebP are
+#             compressed already, so ZIP_STORED costs nothing in size)
+#   tar     - the same as a plain tar
+OUTPUT_SINKS = {
+    "files": {"layout": "flat", "archive": None},
+    "hashed": {"layout": "hashed", "archive": None},
+    "zip": {"layout": "flat", "archive": "zip"},
+    "tar": {"layout": "flat", "archive": "tar"},
+}
+
+# Hex digits of the token hash used per directory level in the hashed layout.
+# One level of 256 buckets keeps directories small up to millions of tokens;
+# a second level would mostly create near-empty directories.
+HASHED_LEVELS = (2,)
+
+def layout_path(token_id, filename, layout="flat"):
+    """Path of a token's file inside a tier (or metadata) directory"""
+    
+    if layout == "flat":
+        return filename
+    if layout == "hashed":
+        digest = hashlib.md5(str(token_id).encode()).hexdigest()
+        levels = []
+        for width in HASHED_LEVELS:
+            levels.append(digest[:width])
+            digest = digest[width:]
+        return "/".join(levels + [filename])
+    raise ValueError(f"Unknown layout {layout!r}")
+
+class DirectorySink:
+    """Writes files in place, creating each directory the first time it is needed"""
+    
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.directories = set()
+    
+    def _make_parent(self, path):
+        directory = os.path.dirname(path)
+        if directory not in self.directories:
+            os.makedirs(directory, exist_ok=True)
+            self.directories.add(directory)
+    
+    def open(self, path):
+        self._make_parent(path)
+        return open(path, 'wb')
+    
+    def write(self, path, data):
+        with self.open(path) as f:
+            f.write(data)
+    
+    def location(self, path):
+        """Where a path under output_dir ends up, for reports"""
+        return path
+    
+    def close(self):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ArchiveSink(DirectorySink):
+    """Base for sinks that store output_dir-relative paths in one archive file"""
+    
+    def __init__(self, output_dir, archive_path):
+        super().__init__(output_dir)
+        self.archive_path = archive_path
+    
+    def arcname(self, path):
+        return os.path.relpath(path, self.output_dir).replace(os.sep, "/")
+    
+    def location(self, path):
+        return f"{self.archive_path}:{self.arcname(path)}"
+
+class ZipSink(ArchiveSink):
+    """Streams files into an uncompressed ZIP with fixed timestamps (reproducible bytes)"""
+    
+    def __init__(self, output_dir, archive_path):
+        super().__init__(output_dir, archive_path)
+        self.zip = zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_STORED, allowZip64=True)
+    
+    def _info(self, path):
+        info = zipfile.ZipInfo(self.arcname(path))
+        info.external_attr = 0o644 << 16
+        return info
+    
+    def open(self, path):
+        return self.zip.open(self._info(path), 'w', force_zip64=True)
+    
+    def write(self, path, data):
+        self.zip.writestr(self._info(path), data)
+    
+    def close(self):
+        self.zip.close()
+
+class TarSink(ArchiveSink):
+    """Streams files into a plain tar with fixed timestamps (reproducible bytes)"""
+    
+    def __init__(self, output_dir, archive_path):
+        super().__init__(output_dir, archive_path)
+        self.tar = tarfile.open(archive_path, 'w')
+    
+    @contextmanager
+    def open(self, path):
+        # Tar headers need the size up front, so streamed members are buffered
+        buffer = io.BytesIO()
+        yield buffer
+        self.write(path, buffer.getvalue())
+    
+    def write(self, path, data):
+        info = tarfile.TarInfo(self.arcname(path))
+        info.size = len(data)
+        info.mode = 0o644
+        self.tar.addfile(info, io.BytesIO(data))
+    
+    def close(self):
+        self.tar.close()
+
+def open_sink(sink, output_dir, archive_name="collection"):
+    """Open an OUTPUT_SINKS sink; archives are written to output_dir/<archive_name>.<zip|tar>"""
+    
+    if sink not in OUTPUT_SINKS:
+        raise ValueError(f"Unknown output sink {sink!r} (choose from {', '.join(OUTPUT_SINKS)})")
+    archive = OUTPUT_SINKS[sink]["archive"]
+    os.makedirs(output_dir, exist_ok=True)
+    if archive == "zip":
+        return ZipSink(output_dir, f"{output_dir}/{archive_name}.zip")
+    if archive == "tar":
+        return TarSink(output_dir, f"{output_dir}/{archive_name}.tar")
+    return DirectorySink(output_dir)
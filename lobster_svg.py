@@ -0,0 +1,104 @@
+import argparse
+import math
+import random
+
+from simple_lobster import TRAITS, compile_layer, generate_traits, lobster_layers, replay_display_list, w, h
+
+def svg_number(value):
+    """Shortest text for a coordinate (two decimals are plenty at 1400px)"""
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+def svg_color(color):
+    return "#%02x%02x%02x" % color if color is not None else "none"
+
+class SVGDraw:
+    """Turns the ImageDraw calls of a display list into SVG elements
+    
+    Outlines follow Pillow: rectangles, ellipses and arcs are stroked inside
+    their box, so the vector lobster has the same silhouette as the PNG.
+    """
+    
+    def __init__(self):
+        self.elements = []
+    
+    def _style(self, fill=None, outline=None, width=1):
+        style = f'fill="{svg_color(fill)}"'
+        if outline is not None:
+            style += f' stroke="{svg_color(outline)}" stroke-width="{svg_number(width)}"'
+        return style
+    
+    def _box(self, xy, inset):
+        (x0, y0), (x1, y1) = xy
+        return x0 + inset, y0 + inset, x1 - inset, y1 - inset
+    
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        x0, y0, x1, y1 = self._box(xy, width / 2 if outline is not None else 0)
+        self.elements.append(
+            f'<rect x="{svg_number(x0)}" y="{svg_number(y0)}" width="{svg_number(x1 - x0)}" '
+            f'height="{svg_number(y1 - y0)}" {self._style(fill, outline, width)}/>')
+    
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        x0, y0, x1, y1 = self._box(xy, width / 2 if outline is not None else 0)
+        self.elements.append(
+            f'<ellipse cx="{svg_number((x0 + x1) / 2)}" cy="{svg_number((y0 + y1) / 2)}" '
+            f'rx="{svg_number((x1 - x0) / 2)}" ry="{svg_number((y1 - y0) / 2)}" '
+            f'{self._style(fill, outline, width)}/>')
+    
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        points = " ".join(f"{svg_number(px)},{svg_number(py)}" for px, py in xy)
+        self.elements.append(f'<polygon points="{points}" {self._style(fill, outline, width)}/>')
+    
+    def line(self, xy, fill=None, width=0):
+        points = " ".join(f"{svg_number(px)},{svg_number(py)}" for px, py in xy)
+        self.elements.append(f'<polyline points="{points}" {self._style(None, fill, max(width, 1))}/>')
+    
+    def arc(self, xy, start, end, fill=None, width=1):
+        x0, y0, x1, y1 = self._box(xy, width / 2)
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        rx, ry = (x1 - x0) / 2, (y1 - y0) / 2
+        # Pillow measures degrees clockwise from 3 o'clock, which is SVG's sweep direction
+        sx = cx + rx * math.cos(math.radians(start))
+        sy = cy + ry * math.sin(math.radians(start))
+        ex = cx + rx * math.cos(math.radians(end))
+        ey = cy + ry * math.sin(math.radians(end))
+        large_arc = 1 if (end - start) % 360 > 180 else 0
+        self.elements.append(
+            f'<path d="M{svg_number(sx)} {svg_number(sy)} A{svg_number(rx)} {svg_number(ry)} 0 '
+            f'{large_arc} 1 {svg_number(ex)} {svg_number(ey)}" {self._style(None, fill, width)}/>')
+
+def svg_lobster(traits, rng=None, size=None, layers=None):
+    """Render a lobster as an SVG document
+    
+    Uses the same display lists (and so the same shapes and random details
+    for the same rng) as the PNG renderer. The drawing keeps the 1400px
+    coordinate system in its viewBox; size only sets the displayed width.
+    Pass layers (from lobster_layers) instead of rng to reuse a token's layers.
+    """
+    
+    if layers is None:
+        layers = lobster_layers(traits, rng)
+    if size is None:
+        size = w
+    
+    bg_color = TRAITS["Background"][traits["Background"]]["color"]
+    draw = SVGDraw()
+    draw.rectangle([(0, 0), (w, h)], fill=bg_color)
+    for layer, args in layers:
+        replay_display_list(draw, compile_layer(layer, args), w / 2, h / 2)
+    
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {w} {h}" '
+            f'width="{size}" height="{round(h * size / w)}">'
+            + "".join(draw.elements) + "</svg>\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render one random lobster as SVG")
+    parser.add_argument("output", help="SVG file to write")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the traits and details")
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed) if args.seed is not None else random
+    traits = generate_traits(rng)
+    with open(args.output, 'w') as f:
+        f.write(svg_lobster(traits, rng))
+    print(f"✅ SVG lobster saved to: {args.output}")
@@ -1,4 +1,5 @@
 from PIL import Image, ImageDraw
+from functools import lru_cache
 import random
 import math
 import json
@@ -7,6 +8,18 @@ import json
 w, h = 1400, 1400
 line_thickness = 7
 
+# Lobster proportions shared by the trait layers
+body_width = 120
+body_height = 150
+head_radius = 50
+eye_spacing = 30
+stalk_height = 35
+eye_size = 20
+antenna_spacing = 25
+
+# Number of seeded variants for layers with random details (spots, googly pupils)
+LAYER_VARIANTS = 8
+
 # NFT Traits Configuration with Rarity
 TRAITS = {
     "Background": {
@@ -88,36 +101,57 @@ TRAITS = {
     },
 }
 
-def weighted_choice(trait_dict):
+def token_rng(seed, token_id):
+    """Return the random generator for one token of a seeded collection"""
+    return random.Random(f"{seed}-{token_id}")
+
+def weighted_choice(trait_dict, rng=None):
+    if rng is None:
+        rng = random
     traits = list(trait_dict.keys())
     weights = [trait_dict[t]["rarity"] for t in traits]
-    return random.choices(traits, weights=weights)[0]
+    return rng.choices(traits, weights=weights)[0]
 
-def generate_traits():
+def generate_traits(rng=None):
     traits = {}
     for category, options in TRAITS.items():
-        traits[category] = weighted_choice(options)
+        traits[category] = weighted_choice(options, rng)
     return traits
 
-def draw_simple_lobster(draw, center_x, center_y, traits, bg_color):
-    """Draw a simple, clean lobster"""
-    
-    shell_color = TRAITS["Shell Color"][traits["Shell Color"]]["color"]
-    claw_size = TRAITS["Claw Size"][traits["Claw Size"]]["size"]
-    eye_style = TRAITS["Eyes"][traits["Eyes"]]["style"]
-    tail_pattern = TRAITS["Tail"][traits["Tail"]]["pattern"]
-    accessory = TRAITS["Accessory"][traits["Accessory"]]["type"]
-    
-    # Darker outline color
-    dark_color = (
-        int(shell_color[0] * 0.6),
-        int(shell_color[1] * 0.6),
-        int(shell_color[2] * 0.6)
+def darken(color):
+    """Darker outline color for a shell color"""
+    return (
+        int(color[0] * 0.6),
+        int(color[1] * 0.6),
+        int(color[2] * 0.6)
     )
+
+def lobster_anchors(y):
+    """Vertical reference points (body top, head center, eye base) for a lobster at y"""
+    body_y = y - 80
+    head_y = body_y - 20
+    eye_y = head_y - 10
+    return body_y, head_y, eye_y
+
+def variant_rng(layer, variant):
+    """Random generator for one seeded variant of a layer with random details"""
+    return random.Random(f"{layer}-{variant}")
+
+def layer_variants(traits, rng):
+    """Pick the seeded variants for the tail spots and googly pupils"""
+    tail_variant = 0
+    eye_variant = 0
+    if TRAITS["Tail"][traits["Tail"]]["pattern"] == "spotted":
+        tail_variant = rng.randrange(LAYER_VARIANTS)
+    if TRAITS["Eyes"][traits["Eyes"]]["style"] == "googly":
+        eye_variant = rng.randrange(LAYER_VARIANTS)
+    return tail_variant, eye_variant
+
+def draw_tail(draw, x, y, shell_color, tail_pattern, variant=0):
+    """Draw the segmented tail and tail fan"""
     
-    # Positioning
-    x = center_x
-    y = center_y
+    dark_color = darken(shell_color)
+    spots = variant_rng("tail", variant)
     
     ###########
     # TAIL (simple segmented shape)
@@ -142,7 +176,7 @@ def draw_simple_lobster(draw, center_x, center_y, traits, bg_color):
                       fill=seg_fill, outline=dark_color, width=line_thickness)
         
         if tail_pattern == "spotted":
-            spot_x = x + random.uniform(-20, 20)
+            spot_x = x + spots.uniform(-20, 20)
             spot_y = seg_y + 15
             draw.ellipse([spot_x - 6, spot_y - 6, spot_x + 6, spot_y + 6],
                         fill=dark_color)
@@ -159,14 +193,16 @@ def draw_simple_lobster(draw, center_x, center_y, traits, bg_color):
         (x + 60, fan_y),
     ]
     draw.polygon(fan_points, fill=shell_color, outline=dark_color, width=line_thickness)
+
+def draw_body(draw, x, y, shell_color):
+    """Draw the body oval and the head"""
+    
+    dark_color = darken(shell_color)
+    body_y, head_y, eye_y = lobster_anchors(y)
     
     ###########
     # BODY (simple oval)
     ###########
-    body_width = 120
-    body_height = 150
-    body_y = y - 80
-    
     draw.ellipse([x - body_width/2, body_y, 
                   x + body_width/2, body_y + body_height],
                  fill=shell_color, outline=dark_color, width=line_thickness)
@@ -174,20 +210,105 @@ def draw_simple_lobster(draw, center_x, center_y, traits, bg_color):
     ###########
     # HEAD (smaller circle on top)
     ###########
-    head_radius = 50
-    head_y = body_y - 20
-    
     draw.ellipse([x - head_radius, head_y - head_radius,
                   x + head_radius, head_y + head_radius],
                  fill=shell_color, outline=dark_color, width=line_thickness)
+
+def draw_normal_eyes(draw, x, eye_y, dark_color, pupils):
+    for eye_x in [x - eye_spacing, x + eye_spacing]:
+        draw.ellipse([eye_x - eye_size/2, eye_y - stalk_height - eye_size/2,
+                     eye_x + eye_size/2, eye_y - stalk_height + eye_size/2],
+                    fill=(255, 255, 255), outline=dark_color, width=line_thickness)
+        # Pupil
+        draw.ellipse([eye_x - 6, eye_y - stalk_height - 6,
+                     eye_x + 6, eye_y - stalk_height + 6],
+                    fill=(0, 0, 0))
+
+def draw_googly_eyes(draw, x, eye_y, dark_color, pupils):
+    for eye_x in [x - eye_spacing, x + eye_spacing]:
+        draw.ellipse([eye_x - eye_size/2, eye_y - stalk_height - eye_size/2,
+                     eye_x + eye_size/2, eye_y - stalk_height + eye_size/2],
+                    fill=(255, 255, 255), outline=dark_color, width=line_thickness)
+        # Random pupil position
+        offset_x = pupils.uniform(-5, 5)
+        offset_y = pupils.uniform(-5, 5)
+        draw.ellipse([eye_x - 5 + offset_x, eye_y - stalk_height - 5 + offset_y,
+                     eye_x + 5 + offset_x, eye_y - stalk_height + 5 + offset_y],
+                    fill=(0, 0, 0))
+
+def draw_angry_eyes(draw, x, eye_y, dark_color, pupils):
+    for i, eye_x in enumerate([x - eye_spacing, x + eye_spacing]):
+        draw.ellipse([eye_x - eye_size/2, eye_y - stalk_height - eye_size/2,
+                     eye_x + eye_size/2, eye_y - stalk_height + eye_size/2],
+                    fill=(255, 255, 255), outline=dark_color, width=line_thickness)
+        # Eyebrow
+        if i == 0:  # Left
+            draw.line([(eye_x - 12, eye_y - stalk_height - 15),
+                      (eye_x + 8, eye_y - stalk_height - 8)],
+                     fill=dark_color, width=line_thickness)
+        else:  # Right
+            draw.line([(eye_x - 8, eye_y - stalk_height - 8),
+                      (eye_x + 12, eye_y - stalk_height - 15)],
+                     fill=dark_color, width=line_thickness)
+        # Pupil
+        draw.ellipse([eye_x - 5, eye_y - stalk_height - 5,
+                     eye_x + 5, eye_y - stalk_height + 5],
+                    fill=(0, 0, 0))
+
+def draw_hearts_eyes(draw, x, eye_y, dark_color, pupils):
+    for eye_x in [x - eye_spacing, x + eye_spacing]:
+        eye_cy = eye_y - stalk_height
+        # Simple heart with two circles and triangle
+        draw.ellipse([eye_x - 10, eye_cy - 12, eye_x, eye_cy - 2],
+                    fill=(255, 100, 150), outline=dark_color, width=3)
+        draw.ellipse([eye_x, eye_cy - 12, eye_x + 10, eye_cy - 2],
+                    fill=(255, 100, 150), outline=dark_color, width=3)
+        draw.polygon([(eye_x - 10, eye_cy - 6), (eye_x + 10, eye_cy - 6), (eye_x, eye_cy + 8)],
+                    fill=(255, 100, 150), outline=dark_color, width=3)
+
+def draw_stars_eyes(draw, x, eye_y, dark_color, pupils):
+    for eye_x in [x - eye_spacing, x + eye_spacing]:
+        eye_cy = eye_y - stalk_height
+        # Simple 5-pointed star
+        star_pts = []
+        for i in range(10):
+            angle = i * 36 - 90
+            radius = 12 if i % 2 == 0 else 5
+            px = eye_x + radius * math.cos(math.radians(angle))
+            py = eye_cy + radius * math.sin(math.radians(angle))
+            star_pts.append((px, py))
+        draw.polygon(star_pts, fill=(255, 220, 100), outline=dark_color, width=3)
+
+def draw_laser_eyes(draw, x, eye_y, dark_color, pupils):
+    for eye_x in [x - eye_spacing, x + eye_spacing]:
+        eye_cy = eye_y - stalk_height
+        draw.ellipse([eye_x - eye_size/2, eye_cy - eye_size/2,
+                     eye_x + eye_size/2, eye_cy + eye_size/2],
+                    fill=(255, 0, 0), outline=(255, 100, 100), width=4)
+        # Laser beam
+        draw.line([(eye_x, eye_cy - eye_size/2), (eye_x, eye_cy - 80)],
+                 fill=(255, 0, 0), width=5)
+
+# Eye "style" -> painter for the eyeballs on top of the stalks
+EYE_PAINTERS = {
+    "normal": draw_normal_eyes,
+    "googly": draw_googly_eyes,
+    "angry": draw_angry_eyes,
+    "hearts": draw_hearts_eyes,
+    "stars": draw_stars_eyes,
+    "laser": draw_laser_eyes,
+}
+
+def draw_eyes(draw, x, y, shell_color, eye_style, variant=0):
+    """Draw the eye stalks and eyes"""
+    
+    dark_color = darken(shell_color)
+    body_y, head_y, eye_y = lobster_anchors(y)
+    pupils = variant_rng("eyes", variant)
     
     ###########
     # EYES (on stalks)
     ###########
-    eye_spacing = 30
-    stalk_height = 35
-    eye_y = head_y - 10
-    
     # Left eye stalk
     draw.line([(x - eye_spacing, eye_y), 
                (x - eye_spacing, eye_y - stalk_height)],
@@ -199,82 +320,15 @@ def draw_simple_lobster(draw, center_x, center_y, traits, bg_color):
               fill=shell_color, width=line_thickness + 2)
     
     # Eye balls
-    eye_size = 20
-    
-    if eye_style == "normal":
-        for eye_x in [x - eye_spacing, x + eye_spacing]:
-            draw.ellipse([eye_x - eye_size/2, eye_y - stalk_height - eye_size/2,
-                         eye_x + eye_size/2, eye_y - stalk_height + eye_size/2],
-                        fill=(255, 255, 255), outline=dark_color, width=line_thickness)
-            # Pupil
-            draw.ellipse([eye_x - 6, eye_y - stalk_height - 6,
-                         eye_x + 6, eye_y - stalk_height + 6],
-                        fill=(0, 0, 0))
-    
-    elif eye_style == "googly":
-        for eye_x in [x - eye_spacing, x + eye_spacing]:
-            draw.ellipse([eye_x - eye_size/2, eye_y - stalk_height - eye_size/2,
-                         eye_x + eye_size/2, eye_y - stalk_height + eye_size/2],
-                        fill=(255, 255, 255), outline=dark_color, width=line_thickness)
-            # Random pupil position
-            offset_x = random.uniform(-5, 5)
-            offset_y = random.uniform(-5, 5)
-            draw.ellipse([eye_x - 5 + offset_x, eye_y - stalk_height - 5 + offset_y,
-                         eye_x + 5 + offset_x, eye_y - stalk_height + 5 + offset_y],
-                        fill=(0, 0, 0))
-    
-    elif eye_style == "angry":
-        for i, eye_x in enumerate([x - eye_spacing, x + eye_spacing]):
-            draw.ellipse([eye_x - eye_size/2, eye_y - stalk_height - eye_size/2,
-                         eye_x + eye_size/2, eye_y - stalk_height + eye_size/2],
-                        fill=(255, 255, 255), outline=dark_color, width=line_thickness)
-            # Eyebrow
-            if i == 0:  # Left
-                draw.line([(eye_x - 12, eye_y - stalk_height - 15),
-                          (eye_x + 8, eye_y - stalk_height - 8)],
-                         fill=dark_color, width=line_thickness)
-            else:  # Right
-                draw.line([(eye_x - 8, eye_y - stalk_height - 8),
-                          (eye_x + 12, eye_y - stalk_height - 15)],
-                         fill=dark_color, width=line_thickness)
-            # Pupil
-            draw.ellipse([eye_x - 5, eye_y - stalk_height - 5,
-                         eye_x + 5, eye_y - stalk_height + 5],
-                        fill=(0, 0, 0))
-    
-    elif eye_style == "hearts":
-        for eye_x in [x - eye_spacing, x + eye_spacing]:
-            eye_cy = eye_y - stalk_height
-            # Simple heart with two circles and triangle
-            draw.ellipse([eye_x - 10, eye_cy - 12, eye_x, eye_cy - 2],
-                        fill=(255, 100, 150), outline=dark_color, width=3)
-            draw.ellipse([eye_x, eye_cy - 12, eye_x + 10, eye_cy - 2],
-                        fill=(255, 100, 150), outline=dark_color, width=3)
-            draw.polygon([(eye_x - 10, eye_cy - 6), (eye_x + 10, eye_cy - 6), (eye_x, eye_cy + 8)],
-                        fill=(255, 100, 150), outline=dark_color, width=3)
-    
-    elif eye_style == "stars":
-        for eye_x in [x - eye_spacing, x + eye_spacing]:
-            eye_cy = eye_y - stalk_height
-            # Simple 5-pointed star
-            star_pts = []
-            for i in range(10):
-                angle = i * 36 - 90
-                radius = 12 if i % 2 == 0 else 5
-                px = eye_x + radius * math.cos(math.radians(angle))
-                py = eye_cy + radius * math.sin(math.radians(angle))
-                star_pts.append((px, py))
-            draw.polygon(star_pts, fill=(255, 220, 100), outline=dark_color, width=3)
-    
-    elif eye_style == "laser":
-        for eye_x in [x - eye_spacing, x + eye_spacing]:
-            eye_cy = eye_y - stalk_height
-            draw.ellipse([eye_x - eye_size/2, eye_cy - eye_size/2,
-                         eye_x + eye_size/2, eye_cy + eye_size/2],
-                        fill=(255, 0, 0), outline=(255, 100, 100), width=4)
-            # Laser beam
-            draw.line([(eye_x, eye_cy - eye_size/2), (eye_x, eye_cy - 80)],
-                     fill=(255, 0, 0), width=5)
+    painter = EYE_PAINTERS.get(eye_style)
+    if painter is not None:
+        painter(draw, x, eye_y, dark_color, pupils)
+
+def draw_claws(draw, x, y, shell_color, claw_size):
+    """Draw both claws"""
+    
+    dark_color = darken(shell_color)
+    body_y, head_y, eye_y = lobster_anchors(y)
     
     ###########
     # CLAWS (two kite/diamond shapes as pincers - BIGGER)
@@ -331,425 +385,698 @@ def draw_simple_lobster(draw, center_x, center_y, traits, bg_color):
         (right_claw_x + base_claw_size * 0.6, claw_y),
     ]
     draw.polygon(lower_pincer_right, fill=shell_color, outline=dark_color, width=line_thickness)
+
+def accessory_anchors(y):
+    """Reference points accessories are placed against for a lobster at y"""
+    body_y, head_y, eye_y = lobster_anchors(y)
+    return {
+        "body_y": body_y,
+        "head_y": head_y,
+        "eye_y": eye_y,
+        "hat_y": head_y - head_radius - 10,
+        "glasses_y": eye_y - 5,
+        "bow_y": body_y + body_height - 20,
+    }
+
+###########
+# HEAD ACCESSORIES
+###########
+
+def draw_crown(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
     
-    ###########
-    # ACCESSORY
-    ###########
-    # Helper positions
-    hat_y = head_y - head_radius - 10
-    glasses_y = eye_y - 5
-    bow_y = body_y + body_height - 20
-    antenna_spacing = 25
-    
-    # HEAD ACCESSORIES
-    if accessory == "crown":
-        crown_pts = [
-            (x - 35, hat_y), (x - 25, hat_y - 25), (x - 12, hat_y - 10),
-            (x, hat_y - 30), (x + 12, hat_y - 10), (x + 25, hat_y - 25), (x + 35, hat_y),
-        ]
-        draw.polygon(crown_pts, fill=(255, 215, 0), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "chef_hat":
-        draw.rectangle([x - 45, hat_y, x + 45, hat_y + 15],
-                      fill=(255, 255, 255), outline=dark_color, width=line_thickness)
-        draw.ellipse([x - 40, hat_y - 40, x + 40, hat_y + 8],
-                    fill=(255, 255, 255), outline=dark_color, width=line_thickness)
+    crown_pts = [
+        (x - 35, hat_y), (x - 25, hat_y - 25), (x - 12, hat_y - 10),
+        (x, hat_y - 30), (x + 12, hat_y - 10), (x + 25, hat_y - 25), (x + 35, hat_y),
+    ]
+    draw.polygon(crown_pts, fill=(255, 215, 0), outline=dark_color, width=line_thickness)
+
+def draw_chef_hat(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
     
-    elif accessory == "pirate_hat":
-        hat_pts = [(x - 55, hat_y), (x - 40, hat_y - 35), (x + 40, hat_y - 35), (x + 55, hat_y)]
-        draw.polygon(hat_pts, fill=(40, 40, 40), outline=dark_color, width=line_thickness)
-        draw.ellipse([x - 15, hat_y - 25, x + 15, hat_y - 5],
-                    fill=(255, 255, 255), outline=dark_color, width=3)
-    
-    elif accessory == "top_hat":
-        draw.rectangle([x - 50, hat_y, x + 50, hat_y + 12],
-                      fill=(40, 40, 40), outline=dark_color, width=line_thickness)
-        draw.rectangle([x - 35, hat_y - 50, x + 35, hat_y],
-                      fill=(40, 40, 40), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "wizard_hat":
-        wizard_pts = [(x - 50, hat_y), (x, hat_y - 60), (x + 50, hat_y)]
-        draw.polygon(wizard_pts, fill=(80, 60, 150), outline=dark_color, width=line_thickness)
-        # Stars on hat
-        for sx in [x - 15, x + 15]:
-            draw.ellipse([sx - 4, hat_y - 30 - 4, sx + 4, hat_y - 30 + 4],
-                        fill=(255, 215, 0))
-    
-    elif accessory == "cowboy_hat":
-        draw.ellipse([x - 55, hat_y - 5, x + 55, hat_y + 15],
-                    fill=(139, 90, 43), outline=dark_color, width=line_thickness)
-        draw.ellipse([x - 35, hat_y - 35, x + 35, hat_y + 5],
-                    fill=(139, 90, 43), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "viking_helmet":
-        draw.ellipse([x - 40, hat_y - 30, x + 40, hat_y + 10],
-                    fill=(180, 180, 180), outline=dark_color, width=line_thickness)
-        # Horns
-        draw.polygon([(x - 40, hat_y - 10), (x - 55, hat_y - 40), (x - 35, hat_y - 15)],
-                    fill=(220, 220, 200), outline=dark_color, width=line_thickness)
-        draw.polygon([(x + 40, hat_y - 10), (x + 55, hat_y - 40), (x + 35, hat_y - 15)],
-                    fill=(220, 220, 200), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "birthday_hat":
-        birthday_pts = [(x - 30, hat_y), (x, hat_y - 50), (x + 30, hat_y)]
-        draw.polygon(birthday_pts, fill=(255, 100, 150), outline=dark_color, width=line_thickness)
-        draw.ellipse([x - 8, hat_y - 58, x + 8, hat_y - 42],
-                    fill=(255, 215, 0))
+    draw.rectangle([x - 45, hat_y, x + 45, hat_y + 15],
+                  fill=(255, 255, 255), outline=dark_color, width=line_thickness)
+    draw.ellipse([x - 40, hat_y - 40, x + 40, hat_y + 8],
+                fill=(255, 255, 255), outline=dark_color, width=line_thickness)
+
+def draw_pirate_hat(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
     
-    elif accessory == "halo":
-        draw.ellipse([x - 35, hat_y - 50, x + 35, hat_y - 35],
-                    fill=None, outline=(255, 215, 0), width=6)
-    
-    elif accessory == "beanie":
-        draw.ellipse([x - 42, hat_y - 25, x + 42, hat_y + 10],
-                    fill=(200, 80, 80), outline=dark_color, width=line_thickness)
-        draw.ellipse([x - 8, hat_y - 30, x + 8, hat_y - 14],
-                    fill=(180, 60, 60))
-    
-    elif accessory == "sombrero":
-        draw.ellipse([x - 65, hat_y, x + 65, hat_y + 15],
-                    fill=(210, 180, 140), outline=dark_color, width=line_thickness)
-        draw.ellipse([x - 35, hat_y - 25, x + 35, hat_y + 8],
-                    fill=(210, 180, 140), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "fez":
-        draw.polygon([(x - 28, hat_y), (x - 22, hat_y - 35), (x + 22, hat_y - 35), (x + 28, hat_y)],
-                    fill=(180, 40, 40), outline=dark_color, width=line_thickness)
-        draw.ellipse([x - 6, hat_y - 42, x + 6, hat_y - 30],
+    hat_pts = [(x - 55, hat_y), (x - 40, hat_y - 35), (x + 40, hat_y - 35), (x + 55, hat_y)]
+    draw.polygon(hat_pts, fill=(40, 40, 40), outline=dark_color, width=line_thickness)
+    draw.ellipse([x - 15, hat_y - 25, x + 15, hat_y - 5],
+                fill=(255, 255, 255), outline=dark_color, width=3)
+
+def draw_top_hat(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    draw.rectangle([x - 50, hat_y, x + 50, hat_y + 12],
+                  fill=(40, 40, 40), outline=dark_color, width=line_thickness)
+    draw.rectangle([x - 35, hat_y - 50, x + 35, hat_y],
+                  fill=(40, 40, 40), outline=dark_color, width=line_thickness)
+
+def draw_wizard_hat(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    wizard_pts = [(x - 50, hat_y), (x, hat_y - 60), (x + 50, hat_y)]
+    draw.polygon(wizard_pts, fill=(80, 60, 150), outline=dark_color, width=line_thickness)
+    # Stars on hat
+    for sx in [x - 15, x + 15]:
+        draw.ellipse([sx - 4, hat_y - 30 - 4, sx + 4, hat_y - 30 + 4],
                     fill=(255, 215, 0))
+
+def draw_cowboy_hat(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
     
-    elif accessory == "baseball_cap":
-        draw.ellipse([x - 40, hat_y - 20, x + 40, hat_y + 10],
-                    fill=(80, 100, 180), outline=dark_color, width=line_thickness)
-        draw.polygon([(x - 42, hat_y), (x - 65, hat_y + 5), (x - 42, hat_y + 10)],
-                    fill=(80, 100, 180), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "backwards_cap":
-        draw.ellipse([x - 40, hat_y - 20, x + 40, hat_y + 10],
-                    fill=(220, 100, 100), outline=dark_color, width=line_thickness)
-        draw.polygon([(x + 42, hat_y), (x + 65, hat_y + 5), (x + 42, hat_y + 10)],
-                    fill=(220, 100, 100), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "beret":
-        draw.ellipse([x - 38, hat_y - 18, x + 38, hat_y + 8],
-                    fill=(100, 60, 100), outline=dark_color, width=line_thickness)
-        draw.ellipse([x - 5, hat_y - 20, x + 5, hat_y - 10],
-                    fill=(90, 50, 90))
-    
-    # FACE ACCESSORIES
-    elif accessory == "sunglasses":
-        draw.ellipse([x - eye_spacing - 18, glasses_y - 15, x - eye_spacing + 18, glasses_y + 15],
-                    fill=(40, 40, 40), outline=dark_color, width=line_thickness)
-        draw.ellipse([x + eye_spacing - 18, glasses_y - 15, x + eye_spacing + 18, glasses_y + 15],
-                    fill=(40, 40, 40), outline=dark_color, width=line_thickness)
-        draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=dark_color, width=line_thickness)
-    
-    elif accessory == "3d_glasses":
-        draw.ellipse([x - eye_spacing - 18, glasses_y - 15, x - eye_spacing + 18, glasses_y + 15],
-                    fill=(255, 50, 50), outline=dark_color, width=line_thickness)
-        draw.ellipse([x + eye_spacing - 18, glasses_y - 15, x + eye_spacing + 18, glasses_y + 15],
-                    fill=(50, 150, 255), outline=dark_color, width=line_thickness)
-        draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=dark_color, width=line_thickness)
-    
-    elif accessory == "monocle":
-        draw.ellipse([x + eye_spacing - 15, glasses_y - 15, x + eye_spacing + 15, glasses_y + 15],
-                    fill=None, outline=dark_color, width=line_thickness + 1)
-        draw.line([(x + eye_spacing + 15, glasses_y), (x + eye_spacing + 25, glasses_y + 15)],
-                 fill=dark_color, width=line_thickness)
-    
-    elif accessory == "aviator_sunglasses":
-        for side_x in [x - eye_spacing, x + eye_spacing]:
-            pts = [(side_x - 18, glasses_y - 15), (side_x + 18, glasses_y - 15),
-                   (side_x + 15, glasses_y + 15), (side_x - 15, glasses_y + 15)]
-            draw.polygon(pts, fill=(100, 100, 100), outline=dark_color, width=line_thickness)
-        draw.line([(x - 12, glasses_y - 5), (x + 12, glasses_y - 5)], fill=dark_color, width=line_thickness)
-    
-    elif accessory == "heart_sunglasses":
-        for side_x in [x - eye_spacing, x + eye_spacing]:
-            draw.ellipse([side_x - 15, glasses_y - 15, side_x - 2, glasses_y - 2],
-                        fill=(255, 100, 150), outline=dark_color, width=3)
-            draw.ellipse([side_x + 2, glasses_y - 15, side_x + 15, glasses_y - 2],
-                        fill=(255, 100, 150), outline=dark_color, width=3)
-            draw.polygon([(side_x - 15, glasses_y - 7), (side_x + 15, glasses_y - 7), (side_x, glasses_y + 12)],
-                        fill=(255, 100, 150), outline=dark_color, width=3)
-        draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=dark_color, width=line_thickness)
-    
-    elif accessory == "star_sunglasses":
-        for side_x in [x - eye_spacing, x + eye_spacing]:
-            star_pts = []
-            for i in range(10):
-                angle = i * 36 - 90
-                radius = 15 if i % 2 == 0 else 7
-                px = side_x + radius * math.cos(math.radians(angle))
-                py = glasses_y + radius * math.sin(math.radians(angle))
-                star_pts.append((px, py))
-            draw.polygon(star_pts, fill=(255, 215, 100), outline=dark_color, width=3)
-        draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=dark_color, width=line_thickness)
-    
-    elif accessory == "nerd_glasses":
-        draw.rectangle([x - eye_spacing - 15, glasses_y - 12, x - eye_spacing + 15, glasses_y + 12],
-                      fill=None, outline=dark_color, width=line_thickness + 1)
-        draw.rectangle([x + eye_spacing - 15, glasses_y - 12, x + eye_spacing + 15, glasses_y + 12],
-                      fill=None, outline=dark_color, width=line_thickness + 1)
-        draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=dark_color, width=line_thickness)
-    
-    elif accessory == "eye_patch":
-        draw.ellipse([x - eye_spacing - 15, glasses_y - 15, x - eye_spacing + 15, glasses_y + 15],
-                    fill=(40, 40, 40), outline=dark_color, width=line_thickness)
-        draw.line([(x - eye_spacing - 15, glasses_y), (x - 60, glasses_y - 20)],
-                 fill=dark_color, width=line_thickness)
-        draw.line([(x - eye_spacing + 15, glasses_y), (x + 60, glasses_y - 20)],
-                 fill=dark_color, width=line_thickness)
-    
-    elif accessory == "mask":
-        mask_pts = [(x - 50, glasses_y), (x - 35, glasses_y - 12), (x + 35, glasses_y - 12), (x + 50, glasses_y),
-                    (x + 50, glasses_y + 15), (x + 35, glasses_y + 12), (x - 35, glasses_y + 12), (x - 50, glasses_y + 15)]
-        draw.polygon(mask_pts, fill=(150, 50, 150), outline=dark_color, width=line_thickness)
-        # Eye holes
-        draw.ellipse([x - eye_spacing - 8, glasses_y - 8, x - eye_spacing + 8, glasses_y + 8],
-                    fill=(0, 0, 0))
-        draw.ellipse([x + eye_spacing - 8, glasses_y - 8, x + eye_spacing + 8, glasses_y + 8],
-                    fill=(0, 0, 0))
+    draw.ellipse([x - 55, hat_y - 5, x + 55, hat_y + 15],
+                fill=(139, 90, 43), outline=dark_color, width=line_thickness)
+    draw.ellipse([x - 35, hat_y - 35, x + 35, hat_y + 5],
+                fill=(139, 90, 43), outline=dark_color, width=line_thickness)
+
+def draw_viking_helmet(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    draw.ellipse([x - 40, hat_y - 30, x + 40, hat_y + 10],
+                fill=(180, 180, 180), outline=dark_color, width=line_thickness)
+    # Horns
+    draw.polygon([(x - 40, hat_y - 10), (x - 55, hat_y - 40), (x - 35, hat_y - 15)],
+                fill=(220, 220, 200), outline=dark_color, width=line_thickness)
+    draw.polygon([(x + 40, hat_y - 10), (x + 55, hat_y - 40), (x + 35, hat_y - 15)],
+                fill=(220, 220, 200), outline=dark_color, width=line_thickness)
+
+def draw_birthday_hat(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    birthday_pts = [(x - 30, hat_y), (x, hat_y - 50), (x + 30, hat_y)]
+    draw.polygon(birthday_pts, fill=(255, 100, 150), outline=dark_color, width=line_thickness)
+    draw.ellipse([x - 8, hat_y - 58, x + 8, hat_y - 42],
+                fill=(255, 215, 0))
+
+def draw_halo(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    draw.ellipse([x - 35, hat_y - 50, x + 35, hat_y - 35],
+                fill=None, outline=(255, 215, 0), width=6)
+
+def draw_beanie(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    draw.ellipse([x - 42, hat_y - 25, x + 42, hat_y + 10],
+                fill=(200, 80, 80), outline=dark_color, width=line_thickness)
+    draw.ellipse([x - 8, hat_y - 30, x + 8, hat_y - 14],
+                fill=(180, 60, 60))
+
+def draw_sombrero(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    draw.ellipse([x - 65, hat_y, x + 65, hat_y + 15],
+                fill=(210, 180, 140), outline=dark_color, width=line_thickness)
+    draw.ellipse([x - 35, hat_y - 25, x + 35, hat_y + 8],
+                fill=(210, 180, 140), outline=dark_color, width=line_thickness)
+
+def draw_fez(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    draw.polygon([(x - 28, hat_y), (x - 22, hat_y - 35), (x + 22, hat_y - 35), (x + 28, hat_y)],
+                fill=(180, 40, 40), outline=dark_color, width=line_thickness)
+    draw.ellipse([x - 6, hat_y - 42, x + 6, hat_y - 30],
+                fill=(255, 215, 0))
+
+def draw_baseball_cap(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    draw.ellipse([x - 40, hat_y - 20, x + 40, hat_y + 10],
+                fill=(80, 100, 180), outline=dark_color, width=line_thickness)
+    draw.polygon([(x - 42, hat_y), (x - 65, hat_y + 5), (x - 42, hat_y + 10)],
+                fill=(80, 100, 180), outline=dark_color, width=line_thickness)
+
+def draw_backwards_cap(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    draw.ellipse([x - 40, hat_y - 20, x + 40, hat_y + 10],
+                fill=(220, 100, 100), outline=dark_color, width=line_thickness)
+    draw.polygon([(x + 42, hat_y), (x + 65, hat_y + 5), (x + 42, hat_y + 10)],
+                fill=(220, 100, 100), outline=dark_color, width=line_thickness)
+
+def draw_beret(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    draw.ellipse([x - 38, hat_y - 18, x + 38, hat_y + 8],
+                fill=(100, 60, 100), outline=dark_color, width=line_thickness)
+    draw.ellipse([x - 5, hat_y - 20, x + 5, hat_y - 10],
+                fill=(90, 50, 90))
+
+###########
+# FACE ACCESSORIES
+###########
+
+def draw_sunglasses(draw, x, anchors, dark_color):
+    glasses_y = anchors["glasses_y"]
+    
+    draw.ellipse([x - eye_spacing - 18, glasses_y - 15, x - eye_spacing + 18, glasses_y + 15],
+                fill=(40, 40, 40), outline=dark_color, width=line_thickness)
+    draw.ellipse([x + eye_spacing - 18, glasses_y - 15, x + eye_spacing + 18, glasses_y + 15],
+                fill=(40, 40, 40), outline=dark_color, width=line_thickness)
+    draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=dark_color, width=line_thickness)
+
+def draw_3d_glasses(draw, x, anchors, dark_color):
+    glasses_y = anchors["glasses_y"]
+    
+    draw.ellipse([x - eye_spacing - 18, glasses_y - 15, x - eye_spacing + 18, glasses_y + 15],
+                fill=(255, 50, 50), outline=dark_color, width=line_thickness)
+    draw.ellipse([x + eye_spacing - 18, glasses_y - 15, x + eye_spacing + 18, glasses_y + 15],
+                fill=(50, 150, 255), outline=dark_color, width=line_thickness)
+    draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=dark_color, width=line_thickness)
+
+def draw_monocle(draw, x, anchors, dark_color):
+    glasses_y = anchors["glasses_y"]
+    
+    draw.ellipse([x + eye_spacing - 15, glasses_y - 15, x + eye_spacing + 15, glasses_y + 15],
+                fill=None, outline=dark_color, width=line_thickness + 1)
+    draw.line([(x + eye_spacing + 15, glasses_y), (x + eye_spacing + 25, glasses_y + 15)],
+             fill=dark_color, width=line_thickness)
+
+def draw_aviator_sunglasses(draw, x, anchors, dark_color):
+    glasses_y = anchors["glasses_y"]
+    
+    for side_x in [x - eye_spacing, x + eye_spacing]:
+        pts = [(side_x - 18, glasses_y - 15), (side_x + 18, glasses_y - 15),
+               (side_x + 15, glasses_y + 15), (side_x - 15, glasses_y + 15)]
+        draw.polygon(pts, fill=(100, 100, 100), outline=dark_color, width=line_thickness)
+    draw.line([(x - 12, glasses_y - 5), (x + 12, glasses_y - 5)], fill=dark_color, width=line_thickness)
+
+def draw_heart_sunglasses(draw, x, anchors, dark_color):
+    glasses_y = anchors["glasses_y"]
+    
+    for side_x in [x - eye_spacing, x + eye_spacing]:
+        draw.ellipse([side_x - 15, glasses_y - 15, side_x - 2, glasses_y - 2],
+                    fill=(255, 100, 150), outline=dark_color, width=3)
+        draw.ellipse([side_x + 2, glasses_y - 15, side_x + 15, glasses_y - 2],
+                    fill=(255, 100, 150), outline=dark_color, width=3)
+        draw.polygon([(side_x - 15, glasses_y - 7), (side_x + 15, glasses_y - 7), (side_x, glasses_y + 12)],
+                    fill=(255, 100, 150), outline=dark_color, width=3)
+    draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=dark_color, width=line_thickness)
+
+def draw_star_sunglasses(draw, x, anchors, dark_color):
+    glasses_y = anchors["glasses_y"]
+    
+    for side_x in [x - eye_spacing, x + eye_spacing]:
+        star_pts = []
+        for i in range(10):
+            angle = i * 36 - 90
+            radius = 15 if i % 2 == 0 else 7
+            px = side_x + radius * math.cos(math.radians(angle))
+            py = glasses_y + radius * math.sin(math.radians(angle))
+            star_pts.append((px, py))
+        draw.polygon(star_pts, fill=(255, 215, 100), outline=dark_color, width=3)
+    draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=dark_color, width=line_thickness)
+
+def draw_nerd_glasses(draw, x, anchors, dark_color):
+    glasses_y = anchors["glasses_y"]
+    
+    draw.rectangle([x - eye_spacing - 15, glasses_y - 12, x - eye_spacing + 15, glasses_y + 12],
+                  fill=None, outline=dark_color, width=line_thickness + 1)
+    draw.rectangle([x + eye_spacing - 15, glasses_y - 12, x + eye_spacing + 15, glasses_y + 12],
+                  fill=None, outline=dark_color, width=line_thickness + 1)
+    draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=dark_color, width=line_thickness)
+
+def draw_eye_patch(draw, x, anchors, dark_color):
+    glasses_y = anchors["glasses_y"]
+    
+    draw.ellipse([x - eye_spacing - 15, glasses_y - 15, x - eye_spacing + 15, glasses_y + 15],
+                fill=(40, 40, 40), outline=dark_color, width=line_thickness)
+    draw.line([(x - eye_spacing - 15, glasses_y), (x - 60, glasses_y - 20)],
+             fill=dark_color, width=line_thickness)
+    draw.line([(x - eye_spacing + 15, glasses_y), (x + 60, glasses_y - 20)],
+             fill=dark_color, width=line_thickness)
+
+def draw_mask(draw, x, anchors, dark_color):
+    glasses_y = anchors["glasses_y"]
+    
+    mask_pts = [(x - 50, glasses_y), (x - 35, glasses_y - 12), (x + 35, glasses_y - 12), (x + 50, glasses_y),
+                (x + 50, glasses_y + 15), (x + 35, glasses_y + 12), (x - 35, glasses_y + 12), (x - 50, glasses_y + 15)]
+    draw.polygon(mask_pts, fill=(150, 50, 150), outline=dark_color, width=line_thickness)
+    # Eye holes
+    draw.ellipse([x - eye_spacing - 8, glasses_y - 8, x - eye_spacing + 8, glasses_y + 8],
+                fill=(0, 0, 0))
+    draw.ellipse([x + eye_spacing - 8, glasses_y - 8, x + eye_spacing + 8, glasses_y + 8],
+                fill=(0, 0, 0))
+
+def draw_goggles(draw, x, anchors, dark_color):
+    glasses_y = anchors["glasses_y"]
+    
+    draw.ellipse([x - eye_spacing - 18, glasses_y - 15, x - eye_spacing + 18, glasses_y + 15],
+                fill=(150, 200, 220), outline=dark_color, width=line_thickness + 1)
+    draw.ellipse([x + eye_spacing - 18, glasses_y - 15, x + eye_spacing + 18, glasses_y + 15],
+                fill=(150, 200, 220), outline=dark_color, width=line_thickness + 1)
+    draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=(100, 100, 100), width=line_thickness + 2)
+
+###########
+# NECK/BODY ACCESSORIES
+###########
+
+def draw_bow_tie(draw, x, anchors, dark_color):
+    bow_y = anchors["bow_y"]
+    
+    draw.polygon([(x - 35, bow_y - 12), (x - 15, bow_y - 18), (x - 15, bow_y + 18), (x - 35, bow_y + 12)],
+                fill=(200, 50, 50), outline=dark_color, width=line_thickness)
+    draw.polygon([(x + 35, bow_y - 12), (x + 15, bow_y - 18), (x + 15, bow_y + 18), (x + 35, bow_y + 12)],
+                fill=(200, 50, 50), outline=dark_color, width=line_thickness)
+    draw.ellipse([x - 12, bow_y - 12, x + 12, bow_y + 12],
+                fill=(200, 50, 50), outline=dark_color, width=line_thickness)
+
+def draw_necktie(draw, x, anchors, dark_color):
+    bow_y = anchors["bow_y"]
+    
+    draw.polygon([(x - 12, bow_y - 10), (x + 12, bow_y - 10), (x + 8, bow_y + 30), (x - 8, bow_y + 30)],
+                fill=(80, 80, 180), outline=dark_color, width=line_thickness)
+
+def draw_gold_chain(draw, x, anchors, dark_color):
+    bow_y = anchors["bow_y"]
     
-    elif accessory == "goggles":
-        draw.ellipse([x - eye_spacing - 18, glasses_y - 15, x - eye_spacing + 18, glasses_y + 15],
-                    fill=(150, 200, 220), outline=dark_color, width=line_thickness + 1)
-        draw.ellipse([x + eye_spacing - 18, glasses_y - 15, x + eye_spacing + 18, glasses_y + 15],
-                    fill=(150, 200, 220), outline=dark_color, width=line_thickness + 1)
-        draw.line([(x - 12, glasses_y), (x + 12, glasses_y)], fill=(100, 100, 100), width=line_thickness + 2)
-    
-    
-    # NECK/BODY ACCESSORIES
-    elif accessory == "bow_tie":
-        draw.polygon([(x - 35, bow_y - 12), (x - 15, bow_y - 18), (x - 15, bow_y + 18), (x - 35, bow_y + 12)],
-                    fill=(200, 50, 50), outline=dark_color, width=line_thickness)
-        draw.polygon([(x + 35, bow_y - 12), (x + 15, bow_y - 18), (x + 15, bow_y + 18), (x + 35, bow_y + 12)],
-                    fill=(200, 50, 50), outline=dark_color, width=line_thickness)
-        draw.ellipse([x - 12, bow_y - 12, x + 12, bow_y + 12],
-                    fill=(200, 50, 50), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "necktie":
-        draw.polygon([(x - 12, bow_y - 10), (x + 12, bow_y - 10), (x + 8, bow_y + 30), (x - 8, bow_y + 30)],
-                    fill=(80, 80, 180), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "gold_chain":
-        chain_y = bow_y - 15
-        for i in range(7):
-            cx = x - 30 + i * 10
-            draw.ellipse([cx - 4, chain_y - 4, cx + 4, chain_y + 4],
-                        fill=(255, 215, 0), outline=dark_color, width=2)
-        # Pendant
-        draw.polygon([(x - 8, chain_y + 5), (x + 8, chain_y + 5), (x, chain_y + 20)],
+    chain_y = bow_y - 15
+    for i in range(7):
+        cx = x - 30 + i * 10
+        draw.ellipse([cx - 4, chain_y - 4, cx + 4, chain_y + 4],
                     fill=(255, 215, 0), outline=dark_color, width=2)
+    # Pendant
+    draw.polygon([(x - 8, chain_y + 5), (x + 8, chain_y + 5), (x, chain_y + 20)],
+                fill=(255, 215, 0), outline=dark_color, width=2)
+
+def draw_pearl_necklace(draw, x, anchors, dark_color):
+    bow_y = anchors["bow_y"]
+    
+    chain_y = bow_y - 15
+    for i in range(9):
+        cx = x - 32 + i * 8
+        draw.ellipse([cx - 5, chain_y - 5, cx + 5, chain_y + 5],
+                    fill=(245, 245, 250), outline=dark_color, width=2)
+
+def draw_scarf(draw, x, anchors, dark_color):
+    bow_y = anchors["bow_y"]
     
-    elif accessory == "pearl_necklace":
-        chain_y = bow_y - 15
-        for i in range(9):
-            cx = x - 32 + i * 8
-            draw.ellipse([cx - 5, chain_y - 5, cx + 5, chain_y + 5],
-                        fill=(245, 245, 250), outline=dark_color, width=2)
-    
-    elif accessory == "scarf":
-        draw.polygon([(x - 25, bow_y - 15), (x + 25, bow_y - 15), (x + 30, bow_y + 15), (x + 15, bow_y + 40),
-                     (x - 15, bow_y + 40), (x - 30, bow_y + 15)],
-                    fill=(200, 100, 100), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "lei":
-        for angle in range(0, 360, 30):
-            rad = math.radians(angle)
-            fx = x + 35 * math.cos(rad)
-            fy = bow_y + 25 * math.sin(rad)
-            colors = [(255, 100, 150), (255, 200, 100), (150, 100, 255)]
-            color = colors[int(angle / 30) % 3]
-            draw.ellipse([fx - 5, fy - 5, fx + 5, fy + 5], fill=color)
-    
-    elif accessory == "bandana":
-        draw.polygon([(x - 40, head_y), (x + 40, head_y), (x + 30, head_y + 15),
-                     (x - 30, head_y + 15)],
-                    fill=(220, 50, 50), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "medallion":
-        draw.ellipse([x - 15, bow_y + 10, x + 15, bow_y + 40],
-                    fill=(255, 215, 0), outline=dark_color, width=line_thickness)
-        draw.ellipse([x - 8, bow_y + 17, x + 8, bow_y + 33],
-                    fill=(200, 170, 40))
-    
-    # ANTENNAE
-    elif accessory == "antennae_short":
-        antenna_len = 50
-        draw.line([(x - antenna_spacing, head_y - head_radius),
-                   (x - antenna_spacing - 10, head_y - head_radius - antenna_len)],
-                  fill=dark_color, width=line_thickness)
-        draw.line([(x + antenna_spacing, head_y - head_radius),
-                   (x + antenna_spacing + 10, head_y - head_radius - antenna_len)],
-                  fill=dark_color, width=line_thickness)
-    
-    elif accessory == "antennae_long":
-        antenna_len = 90
-        draw.line([(x - antenna_spacing, head_y - head_radius),
-                   (x - antenna_spacing - 15, head_y - head_radius - antenna_len)],
-                  fill=dark_color, width=line_thickness)
-        draw.line([(x + antenna_spacing, head_y - head_radius),
-                   (x + antenna_spacing + 15, head_y - head_radius - antenna_len)],
-                  fill=dark_color, width=line_thickness)
-    
-    elif accessory == "antennae_curly":
+    draw.polygon([(x - 25, bow_y - 15), (x + 25, bow_y - 15), (x + 30, bow_y + 15), (x + 15, bow_y + 40),
+                 (x - 15, bow_y + 40), (x - 30, bow_y + 15)],
+                fill=(200, 100, 100), outline=dark_color, width=line_thickness)
+
+def draw_lei(draw, x, anchors, dark_color):
+    bow_y = anchors["bow_y"]
+    
+    for angle in range(0, 360, 30):
+        rad = math.radians(angle)
+        fx = x + 35 * math.cos(rad)
+        fy = bow_y + 25 * math.sin(rad)
+        colors = [(255, 100, 150), (255, 200, 100), (150, 100, 255)]
+        color = colors[int(angle / 30) % 3]
+        draw.ellipse([fx - 5, fy - 5, fx + 5, fy + 5], fill=color)
+
+def draw_bandana(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    draw.polygon([(x - 40, head_y), (x + 40, head_y), (x + 30, head_y + 15),
+                 (x - 30, head_y + 15)],
+                fill=(220, 50, 50), outline=dark_color, width=line_thickness)
+
+def draw_medallion(draw, x, anchors, dark_color):
+    bow_y = anchors["bow_y"]
+    
+    draw.ellipse([x - 15, bow_y + 10, x + 15, bow_y + 40],
+                fill=(255, 215, 0), outline=dark_color, width=line_thickness)
+    draw.ellipse([x - 8, bow_y + 17, x + 8, bow_y + 33],
+                fill=(200, 170, 40))
+
+###########
+# ANTENNAE
+###########
+
+def draw_antennae_short(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    antenna_len = 50
+    draw.line([(x - antenna_spacing, head_y - head_radius),
+               (x - antenna_spacing - 10, head_y - head_radius - antenna_len)],
+              fill=dark_color, width=line_thickness)
+    draw.line([(x + antenna_spacing, head_y - head_radius),
+               (x + antenna_spacing + 10, head_y - head_radius - antenna_len)],
+              fill=dark_color, width=line_thickness)
+
+def draw_antennae_long(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    antenna_len = 90
+    draw.line([(x - antenna_spacing, head_y - head_radius),
+               (x - antenna_spacing - 15, head_y - head_radius - antenna_len)],
+              fill=dark_color, width=line_thickness)
+    draw.line([(x + antenna_spacing, head_y - head_radius),
+               (x + antenna_spacing + 15, head_y - head_radius - antenna_len)],
+              fill=dark_color, width=line_thickness)
+
+def draw_antennae_curly(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    start_y = head_y - head_radius
+    for side in [-1, 1]:
+        start_x = x + side * antenna_spacing
+        points = [(start_x, start_y)]
+        for i in range(5):
+            curve_offset = side * -15 * math.sin(i * 0.8)
+            points.append((start_x + curve_offset, start_y - i * 12))
+        for i in range(len(points) - 1):
+            draw.line([points[i], points[i + 1]], fill=dark_color, width=line_thickness)
+
+def draw_antennae_rainbow(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    antenna_len = 70
+    colors = [(255, 0, 0), (255, 127, 0), (255, 255, 0), (0, 255, 0), (0, 0, 255), (75, 0, 130)]
+    for i, color in enumerate(colors):
+        offset = i * 2
+        draw.line([(x - antenna_spacing, head_y - head_radius + offset),
+                  (x - antenna_spacing - 15, head_y - head_radius - antenna_len + offset)],
+                 fill=color, width=2)
+        draw.line([(x + antenna_spacing, head_y - head_radius + offset),
+                  (x + antenna_spacing + 15, head_y - head_radius - antenna_len + offset)],
+                 fill=color, width=2)
+
+def draw_antennae_glowing(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    antenna_len = 80
+    draw.line([(x - antenna_spacing, head_y - head_radius),
+               (x - antenna_spacing - 15, head_y - head_radius - antenna_len)],
+              fill=(100, 255, 255), width=line_thickness + 2)
+    draw.line([(x + antenna_spacing, head_y - head_radius),
+               (x + antenna_spacing + 15, head_y - head_radius - antenna_len)],
+              fill=(100, 255, 255), width=line_thickness + 2)
+    # Glow tips
+    for side_x in [x - antenna_spacing - 15, x + antenna_spacing + 15]:
+        draw.ellipse([side_x - 8, head_y - head_radius - antenna_len - 8,
+                     side_x + 8, head_y - head_radius - antenna_len + 8],
+                    fill=(255, 255, 100))
+
+def draw_antennae_zigzag(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    antenna_len = 70
+    for side in [-1, 1]:
+        start_x = x + side * antenna_spacing
         start_y = head_y - head_radius
-        for side in [-1, 1]:
-            start_x = x + side * antenna_spacing
-            points = [(start_x, start_y)]
-            for i in range(5):
-                curve_offset = side * -15 * math.sin(i * 0.8)
-                points.append((start_x + curve_offset, start_y - i * 12))
-            for i in range(len(points) - 1):
-                draw.line([points[i], points[i + 1]], fill=dark_color, width=line_thickness)
-    
-    elif accessory == "antennae_rainbow":
-        antenna_len = 70
-        colors = [(255, 0, 0), (255, 127, 0), (255, 255, 0), (0, 255, 0), (0, 0, 255), (75, 0, 130)]
-        for i, color in enumerate(colors):
-            offset = i * 2
-            draw.line([(x - antenna_spacing, head_y - head_radius + offset),
-                      (x - antenna_spacing - 15, head_y - head_radius - antenna_len + offset)],
-                     fill=color, width=2)
-            draw.line([(x + antenna_spacing, head_y - head_radius + offset),
-                      (x + antenna_spacing + 15, head_y - head_radius - antenna_len + offset)],
-                     fill=color, width=2)
-    
-    elif accessory == "antennae_glowing":
-        antenna_len = 80
-        draw.line([(x - antenna_spacing, head_y - head_radius),
-                   (x - antenna_spacing - 15, head_y - head_radius - antenna_len)],
-                  fill=(100, 255, 255), width=line_thickness + 2)
-        draw.line([(x + antenna_spacing, head_y - head_radius),
-                   (x + antenna_spacing + 15, head_y - head_radius - antenna_len)],
-                  fill=(100, 255, 255), width=line_thickness + 2)
-        # Glow tips
-        for side_x in [x - antenna_spacing - 15, x + antenna_spacing + 15]:
-            draw.ellipse([side_x - 8, head_y - head_radius - antenna_len - 8,
-                         side_x + 8, head_y - head_radius - antenna_len + 8],
-                        fill=(255, 255, 100))
-    
-    elif accessory == "antennae_zigzag":
-        antenna_len = 70
-        for side in [-1, 1]:
-            start_x = x + side * antenna_spacing
-            start_y = head_y - head_radius
-            points = [(start_x, start_y)]
-            for i in range(4):
-                zigzag = 10 if i % 2 == 0 else -10
-                points.append((start_x + side * zigzag, start_y - (i + 1) * 18))
-            for i in range(len(points) - 1):
-                draw.line([points[i], points[i + 1]], fill=dark_color, width=line_thickness)
-    
-    # SPECIAL/LEGENDARY
-    elif accessory == "smoking_cigar":
-        mouth_y = head_y + 20
-        draw.rectangle([x + 15, mouth_y - 3, x + 45, mouth_y + 3],
-                      fill=(139, 90, 43), outline=dark_color, width=2)
-        # Smoke
-        for i in range(3):
-            sx = x + 45 + i * 8
-            sy = mouth_y - 10 - i * 5
-            draw.ellipse([sx - 4, sy - 4, sx + 4, sy + 4],
-                        fill=(200, 200, 200), outline=None)
-    
-    elif accessory == "bubble_pipe":
-        mouth_y = head_y + 20
-        draw.line([(x + 15, mouth_y), (x + 35, mouth_y - 15)],
-                 fill=(100, 70, 40), width=line_thickness)
-        draw.ellipse([x + 30, mouth_y - 20, x + 50, mouth_y],
-                    fill=None, outline=dark_color, width=line_thickness)
-        # Bubbles
-        for i in range(3):
-            bx = x + 50 + i * 12
-            by = mouth_y - 25 - i * 10
-            size = 6 - i
-            draw.ellipse([bx - size, by - size, bx + size, by + size],
-                        fill=(200, 230, 255), outline=(150, 180, 200), width=2)
-    
-    elif accessory == "headphones":
-        draw.arc([x - 50, head_y - head_radius - 35, x + 50, head_y - head_radius + 15],
-                0, 180, fill=(60, 60, 60), width=line_thickness + 2)
-        for side_x in [x - 35, x + 35]:
-            draw.ellipse([side_x - 15, eye_y - 10, side_x + 15, eye_y + 20],
-                        fill=(80, 80, 80), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "vr_headset":
-        draw.rectangle([x - 45, glasses_y - 18, x + 45, glasses_y + 18],
-                      fill=(220, 220, 220), outline=dark_color, width=line_thickness)
-        # Lenses
-        draw.ellipse([x - 25, glasses_y - 10, x - 5, glasses_y + 10],
-                    fill=(100, 150, 200))
-        draw.ellipse([x + 5, glasses_y - 10, x + 25, glasses_y + 10],
-                    fill=(100, 150, 200))
-    
-    elif accessory == "laurel_wreath":
-        for angle in range(-60, 240, 20):
-            rad = math.radians(angle)
-            lx = x + 45 * math.cos(rad)
-            ly = head_y + 45 * math.sin(rad)
-            draw.ellipse([lx - 6, ly - 3, lx + 6, ly + 3],
-                        fill=(100, 180, 100), outline=(80, 140, 80), width=2)
-    
-    elif accessory == "diamond_earring":
-        ear_y = head_y + 10
-        for side_x in [x - head_radius - 5, x + head_radius + 5]:
-            draw.polygon([(side_x, ear_y), (side_x - 5, ear_y + 8), (side_x, ear_y + 12), (side_x + 5, ear_y + 8)],
-                        fill=(200, 230, 255), outline=dark_color, width=2)
-    
-    elif accessory == "flower_crown":
-        for angle in range(0, 180, 30):
-            rad = math.radians(angle + 90)
-            fx = x + 40 * math.cos(rad)
-            fy = head_y - head_radius + 40 * math.sin(rad) - 20
-            colors = [(255, 100, 150), (255, 200, 100), (200, 100, 255), (100, 200, 255)]
-            color = colors[int(angle / 30) % 4]
-            for petal in range(5):
-                petal_rad = math.radians(petal * 72)
-                px = fx + 6 * math.cos(petal_rad)
-                py = fy + 6 * math.sin(petal_rad)
-                draw.ellipse([px - 4, py - 4, px + 4, py + 4], fill=color)
-            draw.ellipse([fx - 3, fy - 3, fx + 3, fy + 3], fill=(255, 215, 0))
-    
-    elif accessory == "propeller_hat":
-        draw.ellipse([x - 35, hat_y - 15, x + 35, hat_y + 10],
-                    fill=(255, 200, 100), outline=dark_color, width=line_thickness)
-        # Propeller
-        draw.ellipse([x - 3, hat_y - 20, x + 3, hat_y - 14],
-                    fill=(180, 180, 180))
-        draw.polygon([(x - 30, hat_y - 25), (x - 5, hat_y - 17), (x + 5, hat_y - 17), (x + 30, hat_y - 25)],
-                    fill=(200, 200, 200), outline=dark_color, width=2)
-    
-    elif accessory == "angel_wings":
-        wing_y = body_y + 60
-        # Left wing
-        for i in range(3):
-            wing_x = x - 60 - i * 15
-            draw.ellipse([wing_x - 20, wing_y - 10 - i * 8, wing_x + 5, wing_y + 20 + i * 8],
-                        fill=(255, 255, 255), outline=dark_color, width=line_thickness)
-        # Right wing
-        for i in range(3):
-            wing_x = x + 60 + i * 15
-            draw.ellipse([wing_x - 5, wing_y - 10 - i * 8, wing_x + 20, wing_y + 20 + i * 8],
-                        fill=(255, 255, 255), outline=dark_color, width=line_thickness)
-    
-    elif accessory == "devil_horns":
-        for side in [-1, 1]:
-            horn_x = x + side * 35
-            horn_y = head_y - head_radius - 5
-            horn_pts = [(horn_x, horn_y), (horn_x + side * 10, horn_y - 25), (horn_x + side * 15, horn_y - 15), (horn_x + side * 5, horn_y)]
-            draw.polygon(horn_pts, fill=(200, 50, 50), outline=dark_color, width=line_thickness)
-
-def generate_single_lobster():
+        points = [(start_x, start_y)]
+        for i in range(4):
+            zigzag = 10 if i % 2 == 0 else -10
+            points.append((start_x + side * zigzag, start_y - (i + 1) * 18))
+        for i in range(len(points) - 1):
+            draw.line([points[i], points[i + 1]], fill=dark_color, width=line_thickness)
+
+###########
+# SPECIAL/LEGENDARY
+###########
+
+def draw_smoking_cigar(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    mouth_y = head_y + 20
+    draw.rectangle([x + 15, mouth_y - 3, x + 45, mouth_y + 3],
+                  fill=(139, 90, 43), outline=dark_color, width=2)
+    # Smoke
+    for i in range(3):
+        sx = x + 45 + i * 8
+        sy = mouth_y - 10 - i * 5
+        draw.ellipse([sx - 4, sy - 4, sx + 4, sy + 4],
+                    fill=(200, 200, 200), outline=None)
+
+def draw_bubble_pipe(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    mouth_y = head_y + 20
+    draw.line([(x + 15, mouth_y), (x + 35, mouth_y - 15)],
+             fill=(100, 70, 40), width=line_thickness)
+    draw.ellipse([x + 30, mouth_y - 20, x + 50, mouth_y],
+                fill=None, outline=dark_color, width=line_thickness)
+    # Bubbles
+    for i in range(3):
+        bx = x + 50 + i * 12
+        by = mouth_y - 25 - i * 10
+        size = 6 - i
+        draw.ellipse([bx - size, by - size, bx + size, by + size],
+                    fill=(200, 230, 255), outline=(150, 180, 200), width=2)
+
+def draw_headphones(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    eye_y = anchors["eye_y"]
+    
+    draw.arc([x - 50, head_y - head_radius - 35, x + 50, head_y - head_radius + 15],
+            0, 180, fill=(60, 60, 60), width=line_thickness + 2)
+    for side_x in [x - 35, x + 35]:
+        draw.ellipse([side_x - 15, eye_y - 10, side_x + 15, eye_y + 20],
+                    fill=(80, 80, 80), outline=dark_color, width=line_thickness)
+
+def draw_vr_headset(draw, x, anchors, dark_color):
+    glasses_y = anchors["glasses_y"]
+    
+    draw.rectangle([x - 45, glasses_y - 18, x + 45, glasses_y + 18],
+                  fill=(220, 220, 220), outline=dark_color, width=line_thickness)
+    # Lenses
+    draw.ellipse([x - 25, glasses_y - 10, x - 5, glasses_y + 10],
+                fill=(100, 150, 200))
+    draw.ellipse([x + 5, glasses_y - 10, x + 25, glasses_y + 10],
+                fill=(100, 150, 200))
+
+def draw_laurel_wreath(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    for angle in range(-60, 240, 20):
+        rad = math.radians(angle)
+        lx = x + 45 * math.cos(rad)
+        ly = head_y + 45 * math.sin(rad)
+        draw.ellipse([lx - 6, ly - 3, lx + 6, ly + 3],
+                    fill=(100, 180, 100), outline=(80, 140, 80), width=2)
+
+def draw_diamond_earring(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    ear_y = head_y + 10
+    for side_x in [x - head_radius - 5, x + head_radius + 5]:
+        draw.polygon([(side_x, ear_y), (side_x - 5, ear_y + 8), (side_x, ear_y + 12), (side_x + 5, ear_y + 8)],
+                    fill=(200, 230, 255), outline=dark_color, width=2)
+
+def draw_flower_crown(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    for angle in range(0, 180, 30):
+        rad = math.radians(angle + 90)
+        fx = x + 40 * math.cos(rad)
+        fy = head_y - head_radius + 40 * math.sin(rad) - 20
+        colors = [(255, 100, 150), (255, 200, 100), (200, 100, 255), (100, 200, 255)]
+        color = colors[int(angle / 30) % 4]
+        for petal in range(5):
+            petal_rad = math.radians(petal * 72)
+            px = fx + 6 * math.cos(petal_rad)
+            py = fy + 6 * math.sin(petal_rad)
+            draw.ellipse([px - 4, py - 4, px + 4, py + 4], fill=color)
+        draw.ellipse([fx - 3, fy - 3, fx + 3, fy + 3], fill=(255, 215, 0))
+
+def draw_propeller_hat(draw, x, anchors, dark_color):
+    hat_y = anchors["hat_y"]
+    
+    draw.ellipse([x - 35, hat_y - 15, x + 35, hat_y + 10],
+                fill=(255, 200, 100), outline=dark_color, width=line_thickness)
+    # Propeller
+    draw.ellipse([x - 3, hat_y - 20, x + 3, hat_y - 14],
+                fill=(180, 180, 180))
+    draw.polygon([(x - 30, hat_y - 25), (x - 5, hat_y - 17), (x + 5, hat_y - 17), (x + 30, hat_y - 25)],
+                fill=(200, 200, 200), outline=dark_color, width=2)
+
+def draw_angel_wings(draw, x, anchors, dark_color):
+    body_y = anchors["body_y"]
+    
+    wing_y = body_y + 60
+    # Left wing
+    for i in range(3):
+        wing_x = x - 60 - i * 15
+        draw.ellipse([wing_x - 20, wing_y - 10 - i * 8, wing_x + 5, wing_y + 20 + i * 8],
+                    fill=(255, 255, 255), outline=dark_color, width=line_thickness)
+    # Right wing
+    for i in range(3):
+        wing_x = x + 60 + i * 15
+        draw.ellipse([wing_x - 5, wing_y - 10 - i * 8, wing_x + 20, wing_y + 20 + i * 8],
+                    fill=(255, 255, 255), outline=dark_color, width=line_thickness)
+
+def draw_devil_horns(draw, x, anchors, dark_color):
+    head_y = anchors["head_y"]
+    
+    for side in [-1, 1]:
+        horn_x = x + side * 35
+        horn_y = head_y - head_radius - 5
+        horn_pts = [(horn_x, horn_y), (horn_x + side * 10, horn_y - 25), (horn_x + side * 15, horn_y - 15), (horn_x + side * 5, horn_y)]
+        draw.polygon(horn_pts, fill=(200, 50, 50), outline=dark_color, width=line_thickness)
+
+# Accessory "type" -> painter, looked up once instead of comparing strings
+ACCESSORY_PAINTERS = {
+    "crown": draw_crown,
+    "chef_hat": draw_chef_hat,
+    "pirate_hat": draw_pirate_hat,
+    "top_hat": draw_top_hat,
+    "wizard_hat": draw_wizard_hat,
+    "cowboy_hat": draw_cowboy_hat,
+    "viking_helmet": draw_viking_helmet,
+    "birthday_hat": draw_birthday_hat,
+    "halo": draw_halo,
+    "beanie": draw_beanie,
+    "sombrero": draw_sombrero,
+    "fez": draw_fez,
+    "baseball_cap": draw_baseball_cap,
+    "backwards_cap": draw_backwards_cap,
+    "beret": draw_beret,
+    "sunglasses": draw_sunglasses,
+    "3d_glasses": draw_3d_glasses,
+    "monocle": draw_monocle,
+    "aviator_sunglasses": draw_aviator_sunglasses,
+    "heart_sunglasses": draw_heart_sunglasses,
+    "star_sunglasses": draw_star_sunglasses,
+    "nerd_glasses": draw_nerd_glasses,
+    "eye_patch": draw_eye_patch,
+    "mask": draw_mask,
+    "goggles": draw_goggles,
+    "bow_tie": draw_bow_tie,
+    "necktie": draw_necktie,
+    "gold_chain": draw_gold_chain,
+    "pearl_necklace": draw_pearl_necklace,
+    "scarf": draw_scarf,
+    "lei": draw_lei,
+    "bandana": draw_bandana,
+    "medallion": draw_medallion,
+    "antennae_short": draw_antennae_short,
+    "antennae_long": draw_antennae_long,
+    "antennae_curly": draw_antennae_curly,
+    "antennae_rainbow": draw_antennae_rainbow,
+    "antennae_glowing": draw_antennae_glowing,
+    "antennae_zigzag": draw_antennae_zigzag,
+    "smoking_cigar": draw_smoking_cigar,
+    "bubble_pipe": draw_bubble_pipe,
+    "headphones": draw_headphones,
+    "vr_headset": draw_vr_headset,
+    "laurel_wreath": draw_laurel_wreath,
+    "diamond_earring": draw_diamond_earring,
+    "flower_crown": draw_flower_crown,
+    "propeller_hat": draw_propeller_hat,
+    "angel_wings": draw_angel_wings,
+    "devil_horns": draw_devil_horns,
+}
+
+def draw_accessory(draw, x, y, shell_color, accessory):
+    """Draw the accessory (accessory is the trait's "type", None for no accessory)"""
+    
+    painter = ACCESSORY_PAINTERS.get(accessory)
+    if painter is not None:
+        painter(draw, x, accessory_anchors(y), darken(shell_color))
+
+# Trait layers, each painted by a function taking (draw, x, y, *layer args)
+LAYER_PAINTERS = {
+    "tail": draw_tail,
+    "body": draw_body,
+    "eyes": draw_eyes,
+    "claws": draw_claws,
+    "accessory": draw_accessory,
+}
+
+class DisplayListRecorder:
+    """Stands in for ImageDraw and records primitives instead of drawing them
+    
+    Every call becomes a (method, points, args, style) tuple, with the box
+    or point list normalized to a tuple of (x, y) pairs.
+    """
+    
+    def __init__(self):
+        self.primitives = []
+    
+    def _record(self, method, xy, args, style):
+        if xy and not isinstance(xy[0], (tuple, list)):
+            xy = list(zip(xy[::2], xy[1::2]))
+        self.primitives.append((method, tuple((px, py) for px, py in xy), args, style))
+    
+    def rectangle(self, xy, **style):
+        self._record("rectangle", xy, (), style)
+    
+    def ellipse(self, xy, **style):
+        self._record("ellipse", xy, (), style)
+    
+    def polygon(self, xy, **style):
+        self._record("polygon", xy, (), style)
+    
+    def line(self, xy, **style):
+        self._record("line", xy, (), style)
+    
+    def arc(self, xy, start, end, **style):
+        self._record("arc", xy, (start, end), style)
+
+@lru_cache(maxsize=None)
+def compile_layer(layer, args):
+    """Display list of one trait layer, with coordinates relative to the lobster center
+    
+    layer and args are as returned by lobster_layers (e.g. ("claws",
+    (shell_color, claw_size))). Each distinct layer is only computed once.
+    """
+    
+    recorder = DisplayListRecorder()
+    LAYER_PAINTERS[layer](recorder, 0, 0, *args)
+    return tuple(recorder.primitives)
+
+def replay_display_list(draw, display_list, center_x, center_y, scale=1.0):
+    """Draw a compiled display list centered at (center_x, center_y)
+    
+    scale resizes every coordinate and stroke width around the center, so
+    the same list renders a full-size lobster or a thumbnail.
+    """
+    
+    for method, points, args, style in display_list:
+        xy = [(center_x + px * scale, center_y + py * scale) for px, py in points]
+        if scale != 1 and "width" in style:
+            style = dict(style, width=max(1, round(style["width"] * scale)))
+        getattr(draw, method)(xy, *args, **style)
+
+def lobster_layers(traits, rng=None):
+    """List the (layer, args) pairs that make up a lobster, back to front"""
+    
+    if rng is None:
+        rng = random
+    
+    shell_color = TRAITS["Shell Color"][traits["Shell Color"]]["color"]
+    claw_size = TRAITS["Claw Size"][traits["Claw Size"]]["size"]
+    eye_style = TRAITS["Eyes"][traits["Eyes"]]["style"]
+    tail_pattern = TRAITS["Tail"][traits["Tail"]]["pattern"]
+    accessory = TRAITS["Accessory"][traits["Accessory"]]["type"]
+    tail_variant, eye_variant = layer_variants(traits, rng)
+    
+    return [
+        ("tail", (shell_color, tail_pattern, tail_variant)),
+        ("body", (shell_color,)),
+        ("eyes", (shell_color, eye_style, eye_variant)),
+        ("claws", (shell_color, claw_size)),
+        ("accessory", (shell_color, accessory)),
+    ]
+
+def draw_simple_lobster(draw, center_x, center_y, traits, bg_color, rng=None, scale=1.0):
+    """Draw a simple, clean lobster (random details come from rng)
+    
+    scale resizes every coordinate and stroke width around the center, e.g.
+    scale=256/1400 draws a 256px preview lobster directly.
+    """
+    
+    # Layers, back to front, replayed from their compiled display lists
+    for layer, args in lobster_layers(traits, rng):
+        replay_display_list(draw, compile_layer(layer, args), center_x, center_y, scale)
+
+def generate_single_lobster(seed=None):
     """Generate one lobster for testing"""
-    traits = generate_traits()
+    rng = random.Random(seed) if seed is not None else random
+    traits = generate_traits(rng)
     bg_color = TRAITS["Background"][traits["Background"]]["color"]
     
     img = Image.new('RGB', (w, h), bg_color)
     draw = ImageDraw.Draw(img)
     
-    draw_simple_lobster(draw, w/2, h/2, traits, bg_color)
+    draw_simple_lobster(draw, w/2, h/2, traits, bg_color, rng=rng)
     
     output_path = "/mnt/user-data/outputs/simple_lobster.png"
     img.save(output_path)
@@ -763,9 +1090,10 @@ def generate_single_lobster():
     
     return output_path
 
-def generate_grid():
+def generate_grid(seed=None):
     """Generate a 5x5 grid of 25 simple lobsters"""
     
+    rng = random.Random(seed) if seed is not None else random
     grid_x = 5
     grid_y = 5
     cell_size = 700
@@ -784,7 +1112,7 @@ def generate_grid():
     for i in range(grid_x):
         for j in range(grid_y):
             # Generate unique traits
-            traits = generate_traits()
+            traits = generate_traits(rng)
             all_traits.append({"lobster_number": lobster_num, "traits": traits})
             
             # Get background color
@@ -805,7 +1133,7 @@ def generate_grid():
             lobster_y = cell_y + cell_size / 2 - 50
             
             # Draw the lobster
-            draw_simple_lobster(draw, lobster_x, lobster_y, traits, lobster_bg)
+            draw_simple_lobster(draw, lobster_x, lobster_y, traits, lobster_bg, rng=rng)
             
             print(f"✓ Lobster #{lobster_num} ({i},{j})")
             lobster_num += 1